@@ -0,0 +1,84 @@
+from typing import Callable, Dict, Type, Tuple
+
+from .action import Action, BuyCardAction, DiscardCardAction, DestroyCardAction, PickWonderAction, BuildWonderAction, \
+    PickStartPlayerAction, PickProgressTokenAction, PickDiscardedCardAction
+from .cards_board import CardsBoard
+from .entity_manager import EntityManager
+from .states.game_state import GameState
+
+
+"""
+Every action has a fixed integer id, ranges follow each other in this order:
+buy card - card id
+discard card - card id
+build wonder - wonder id * CARDS_COUNT + card id
+pick wonder - wonder id
+pick progress token - index in EntityManager.progress_token_names()
+destroy card - card id
+pick discarded card - card id
+pick start player - player index
+A card is on the board at most once, so card positions are restored from the state on decoding.
+"""
+
+CARDS_COUNT = EntityManager.cards_count()
+WONDERS_COUNT = EntityManager.wonders_count()
+TOKEN_NAMES = EntityManager.progress_token_names()
+TOKEN_INDICES = {name: i for i, name in enumerate(TOKEN_NAMES)}
+
+BUY_CARD_OFFSET = 0
+DISCARD_CARD_OFFSET = BUY_CARD_OFFSET + CARDS_COUNT
+BUILD_WONDER_OFFSET = DISCARD_CARD_OFFSET + CARDS_COUNT
+PICK_WONDER_OFFSET = BUILD_WONDER_OFFSET + WONDERS_COUNT * CARDS_COUNT
+PICK_PROGRESS_TOKEN_OFFSET = PICK_WONDER_OFFSET + WONDERS_COUNT
+DESTROY_CARD_OFFSET = PICK_PROGRESS_TOKEN_OFFSET + len(TOKEN_NAMES)
+PICK_DISCARDED_CARD_OFFSET = DESTROY_CARD_OFFSET + CARDS_COUNT
+PICK_START_PLAYER_OFFSET = PICK_DISCARDED_CARD_OFFSET + CARDS_COUNT
+ACTIONS_COUNT = PICK_START_PLAYER_OFFSET + 2
+
+
+_ENCODERS: Dict[Type[Action], Callable[[Action], int]] = {
+    BuyCardAction: lambda action: BUY_CARD_OFFSET + action.card_id,
+    DiscardCardAction: lambda action: DISCARD_CARD_OFFSET + action.card_id,
+    BuildWonderAction: lambda action: BUILD_WONDER_OFFSET + action.wonder_id * CARDS_COUNT + action.card_id,
+    PickWonderAction: lambda action: PICK_WONDER_OFFSET + action.wonder_id,
+    PickProgressTokenAction: lambda action: PICK_PROGRESS_TOKEN_OFFSET + TOKEN_INDICES[action.progress_token],
+    DestroyCardAction: lambda action: DESTROY_CARD_OFFSET + action.card_id,
+    PickDiscardedCardAction: lambda action: PICK_DISCARDED_CARD_OFFSET + action.card_id,
+    PickStartPlayerAction: lambda action: PICK_START_PLAYER_OFFSET + action.player_index,
+}
+
+
+class ActionSpace:
+    @staticmethod
+    def encode(action: Action) -> int:
+        return _ENCODERS[type(action)](action)
+
+    @staticmethod
+    def decode(action_id: int, state: GameState) -> Action:
+        if not 0 <= action_id < ACTIONS_COUNT:
+            raise ValueError
+        if action_id < BUILD_WONDER_OFFSET:
+            card_id = action_id % CARDS_COUNT
+            pos = ActionSpace.card_pos(state, card_id)
+            if action_id < DISCARD_CARD_OFFSET:
+                return BuyCardAction(card_id, pos)
+            return DiscardCardAction(card_id, pos)
+        if action_id < PICK_WONDER_OFFSET:
+            wonder_id, card_id = divmod(action_id - BUILD_WONDER_OFFSET, CARDS_COUNT)
+            return BuildWonderAction(wonder_id, card_id, ActionSpace.card_pos(state, card_id))
+        if action_id < PICK_PROGRESS_TOKEN_OFFSET:
+            return PickWonderAction(action_id - PICK_WONDER_OFFSET)
+        if action_id < DESTROY_CARD_OFFSET:
+            return PickProgressTokenAction(TOKEN_NAMES[action_id - PICK_PROGRESS_TOKEN_OFFSET])
+        if action_id < PICK_DISCARDED_CARD_OFFSET:
+            return DestroyCardAction(action_id - DESTROY_CARD_OFFSET)
+        if action_id < PICK_START_PLAYER_OFFSET:
+            return PickDiscardedCardAction(action_id - PICK_DISCARDED_CARD_OFFSET)
+        return PickStartPlayerAction(action_id - PICK_START_PLAYER_OFFSET)
+
+    @staticmethod
+    def card_pos(state: GameState, card_id: int) -> Tuple[int, int]:
+        for available_card_id, pos in CardsBoard.available_cards(state.cards_board_state):
+            if available_card_id == card_id:
+                return pos
+        raise ValueError
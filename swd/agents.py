@@ -1,6 +1,6 @@
 import random
 from abc import ABC, abstractmethod
-from typing import Sequence, List
+from typing import Callable, Sequence, List
 
 from .action import Action
 from .states.game_state import GameState
@@ -20,6 +20,22 @@ class RandomAgent(Agent):
         return random.choice(possible_actions)
 
 
+class PolicyAgent(Agent):
+    """
+    Plays the moves of a rollout policy, the possible actions are only used when there is no choice.
+    """
+    policy: Callable[[GameState], Action]
+
+    def __init__(self, policy: Callable[[GameState], Action]):
+        super().__init__()
+        self.policy = policy
+
+    def choose_action(self, state: GameState, possible_actions: Sequence[Action]) -> Action:
+        if len(possible_actions) == 1:
+            return possible_actions[0]
+        return self.policy(state)
+
+
 class RecordedAgent(Agent):
     actions: List[Action]
 
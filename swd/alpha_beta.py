@@ -0,0 +1,253 @@
+import itertools
+import math
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .action import Action, BuyCardAction, BuildWonderAction, DiscardCardAction
+from .agents import Agent, PolicyAgent
+from .cards_board import CardsBoard, CLOSED_CARD, NO_CARD, BOARD_ROWS, BOARD_COLUMNS
+from .entity_manager import EntityManager
+from .game import Game
+from .game_random import GameRandom
+from .rollout_policies import HeuristicRollout, greedy_rollout
+from .score import DISTINCT_SCIENTIFIC_SYMBOLS
+from .states.game_state import GameState
+from .transposition_table import TranspositionTable
+
+
+Evaluation = Callable[[GameState], float]
+
+WIN_VALUE = 1000.0
+PAWN_WEIGHT = 0.5
+SCIENCE_WEIGHT = 1.0
+DISCARD_ORDER = -1.0
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def evaluate(state: GameState) -> float:
+    """
+    Heuristic value for player 0: the difference in points, the conflict pawn and distinct scientific symbols.
+    """
+    player_state, opponent_state = state.players_state
+    return Game.points(state, 0)[0] - Game.points(state, 1)[0] + \
+        PAWN_WEIGHT * state.military_track_state.conflict_pawn + \
+        SCIENCE_WEIGHT * (player_state.score[DISTINCT_SCIENTIFIC_SYMBOLS] -
+                          opponent_state.score[DISTINCT_SCIENTIFIC_SYMBOLS])
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaAgent(Agent):
+    """
+    Expectiminimax search with alpha-beta pruning for the end of the last age, earlier moves are left to `fallback`.
+    Values are stored for player 0, who maximizes, so double turns need no special care.
+    Taking a card that turns over face-down cards is a chance node: every combination of unseen cards is searched
+    through the cards board preset, or `chance_outcomes` sampled ones if there are more.
+    The true deck is never looked at, the order of the rest progress tokens is sampled once per search.
+    Iterative deepening goes up to `max_depth` moves until `time_limit` runs out or the game is solved,
+    at the depth limit positions are scored by `evaluation`. Moves are ordered by the best move of the previous
+    iteration and value per coin: points, shields and science of a card or a wonder against its price.
+    With a transposition table positions are cached by their Zobrist hash.
+    """
+    max_depth: int
+    time_limit: Optional[float]
+    max_cards: int
+    chance_outcomes: int
+    fallback: Agent
+    transposition_table: Optional[TranspositionTable]
+    evaluation: Evaluation
+    ordering: HeuristicRollout
+
+    def __init__(self,
+                 max_depth: int = 8,
+                 time_limit: Optional[float] = 1.0,
+                 max_cards: int = 8,
+                 chance_outcomes: int = 8,
+                 fallback: Optional[Agent] = None,
+                 transposition_table: Optional[TranspositionTable] = None,
+                 evaluation: Evaluation = evaluate):
+        super().__init__()
+        if max_depth <= 0 or chance_outcomes <= 0:
+            raise ValueError
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.max_cards = max_cards
+        self.chance_outcomes = chance_outcomes
+        self.fallback = fallback if fallback is not None else PolicyAgent(greedy_rollout)
+        self.transposition_table = transposition_table
+        self.evaluation = evaluation
+        self.ordering = greedy_rollout
+        self.rng = GameRandom()
+        self.nodes = 0
+        self.deadline: Optional[float] = None
+        self.depth = 0
+        self.cutoff = False
+
+    def choose_action(self, state: GameState, possible_actions: Sequence[Action]) -> Action:
+        if len(possible_actions) == 1:
+            return possible_actions[0]
+        if state.age != 2 or CardsBoard.remaining_cards(state.cards_board_state) > self.max_cards:
+            return self.fallback.choose_action(state, possible_actions)
+        action = self.search(state)
+        return next(x for x in possible_actions if x == action)
+
+    def on_action_applied(self, action: Action, new_state: GameState):
+        self.fallback.on_action_applied(action, new_state)
+
+    def search(self, state: GameState) -> Action:
+        if self.transposition_table is not None:
+            self.transposition_table.new_generation()
+        root = state.clone()
+        root.cards_board_state.preset = None
+        Game.shuffle_rest_progress_tokens(root, self.rng)
+
+        self.nodes = 0
+        self.deadline = None
+        start = time.perf_counter()
+        best: Optional[Action] = None
+        for depth in range(1, self.max_depth + 1):
+            self.cutoff = False
+            self.depth = depth
+            try:
+                value, action = self.alpha_beta(root, depth, -math.inf, math.inf)
+            except SearchTimeout:
+                break
+            best = action
+            if not self.cutoff or abs(value) >= WIN_VALUE:
+                break
+            if self.time_limit is not None:
+                self.deadline = start + self.time_limit
+        return best
+
+    def alpha_beta(self, state: GameState, depth: int, alpha: float, beta: float) -> Tuple[float, Optional[Action]]:
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if Game.is_finished(state):
+            return AlphaBetaAgent.terminal_value(state), None
+        if depth == 0:
+            self.cutoff = True
+            return self.evaluation(state), None
+
+        key = state.zobrist_hash if self.transposition_table is not None else None
+        hash_action = None
+        if key is not None:
+            entry = self.transposition_table.get(key)
+            if entry is not None:
+                entry_depth, value, bound, hash_action, solved = entry
+                if (entry_depth >= depth or solved) and depth < self.depth:
+                    if bound == EXACT or bound == LOWER and value >= beta or bound == UPPER and value <= alpha:
+                        self.cutoff = self.cutoff or not solved
+                        return value, hash_action
+
+        cutoff = self.cutoff
+        self.cutoff = False
+        maximizing = state.current_player_index == 0
+        initial_alpha, initial_beta = alpha, beta
+        best_value = -math.inf if maximizing else math.inf
+        best_action = None
+        for action in self.ordered_actions(state, hash_action):
+            value = self.child_value(state, action, depth, alpha, beta)
+            if maximizing:
+                if value > best_value:
+                    best_value, best_action = value, action
+                alpha = max(alpha, value)
+            else:
+                if value < best_value:
+                    best_value, best_action = value, action
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            bound = UPPER if best_value <= initial_alpha else LOWER if best_value >= initial_beta else EXACT
+            self.transposition_table.put(key, (depth, best_value, bound, best_action, not self.cutoff), depth)
+        self.cutoff = self.cutoff or cutoff
+        return best_value, best_action
+
+    def child_value(self, state: GameState, action: Action, depth: int, alpha: float, beta: float) -> float:
+        positions = []
+        if isinstance(action, (BuyCardAction, DiscardCardAction, BuildWonderAction)):
+            positions = CardsBoard.uncovered_positions(state.cards_board_state, action.pos)
+        if len(positions) == 0:
+            record = Game.apply_action(state, action)
+            value, _ = self.alpha_beta(state, depth - 1, alpha, beta)
+            Game.undo_action(state, record)
+            return value
+
+        cards_board_state = state.cards_board_state
+        card_ids, purple_card_ids = Game.unseen_cards(state)
+        pools = [card_ids[cards_board_state.age] if cards_board_state.card_places[i][j] == CLOSED_CARD
+                 else purple_card_ids for i, j in positions]
+        places = [[NO_CARD] * BOARD_COLUMNS for _ in range(BOARD_ROWS)]
+        preset = [[]] * cards_board_state.age + [places]
+        outcomes = self.outcomes(pools)
+        total = 0.0
+        for outcome in outcomes:
+            for (i, j), card_id in zip(positions, outcome):
+                places[i][j] = card_id
+            cards_board_state.preset = preset
+            record = Game.apply_action(state, action)
+            cards_board_state.preset = None
+            value, _ = self.alpha_beta(state, depth - 1, -math.inf, math.inf)
+            Game.undo_action(state, record)
+            total += value
+        return total / len(outcomes)
+
+    def outcomes(self, pools: List[List[int]]) -> List[Tuple[int, ...]]:
+        """
+        Distinct cards for the face-down slots, drawn from `pools`: all combinations or a uniform sample.
+        """
+        count = 1
+        for k, pool in enumerate(pools):
+            count *= len(pool) - sum(1 for x in pools[:k] if x is pool)
+        if count <= self.chance_outcomes:
+            return [outcome for outcome in itertools.product(*pools) if len(set(outcome)) == len(outcome)]
+        result = []
+        for _ in range(self.chance_outcomes):
+            outcome = []
+            for pool in pools:
+                card_id = self.rng.choice(pool)
+                while card_id in outcome:
+                    card_id = self.rng.choice(pool)
+                outcome.append(card_id)
+            result.append(tuple(outcome))
+        return result
+
+    def ordered_actions(self, state: GameState, first: Optional[Action]) -> List[Action]:
+        actions = Game.get_available_actions(state)
+        player_index = state.current_player_index
+        player_state = state.players_state[player_index]
+        pawn = state.military_track_state.conflict_pawn * (1 if player_index == 0 else -1)
+        keys = {}
+        for action in actions:
+            if isinstance(action, BuyCardAction):
+                card = EntityManager.card(action.card_id)
+                value = self.ordering.card_value(state, player_state, pawn, card)
+                keys[id(action)] = value / (max(Game.card_price(state, card, player_index), 0) + 1)
+            elif isinstance(action, BuildWonderAction):
+                wonder = EntityManager.wonder(action.wonder_id)
+                value = self.ordering.wonder_value(pawn, wonder)
+                keys[id(action)] = value / (Game.wonder_price(state, wonder, player_index) + 1)
+            elif isinstance(action, DiscardCardAction):
+                keys[id(action)] = DISCARD_ORDER
+            else:
+                keys[id(action)] = 0.0
+        result = sorted(actions, key=lambda x: keys[id(x)], reverse=True)
+        if first is not None and first in result:
+            result.remove(first)
+            result.insert(0, first)
+        return result
+
+    @staticmethod
+    def terminal_value(state: GameState) -> float:
+        if state.winner == 0:
+            return WIN_VALUE
+        if state.winner == 1:
+            return -WIN_VALUE
+        return 0.0
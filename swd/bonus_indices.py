@@ -0,0 +1,84 @@
+# Generated by `python -m swd.codegen` from swd/bonuses.py, do not edit.
+
+WOOD = 0
+CLAY = 1
+STONE = 2
+GLASS = 3
+PAPER = 4
+MATERIALS = 5
+GOODS = 6
+WOOD_TRADE = 7
+CLAY_TRADE = 8
+STONE_TRADE = 9
+GLASS_TRADE = 10
+PAPER_TRADE = 11
+HORSESHOE = 12
+SWORD = 13
+TOWER = 14
+TARGET = 15
+HELMET = 16
+BOOK = 17
+GEAR = 18
+HARP = 19
+TEAPOT = 20
+MASK = 21
+COLUMN = 22
+MOON = 23
+SUN = 24
+DROP = 25
+TEMPLE = 26
+VASE = 27
+BARREL = 28
+ARMILLARY_SPHERE = 29
+WHEEL = 30
+SUNDIAL = 31
+MORTAR_AND_PESTLE = 32
+PLUMB = 33
+FEATHER = 34
+LAW = 35
+POINTS = 36
+BLUE_MAX_POINTS = 37
+BROWN_GRAY_MAX_POINTS = 38
+COINS_MAX_POINTS = 39
+GREEN_MAX_POINTS = 40
+RED_MAX_POINTS = 41
+WONDER_MAX_POINTS = 42
+YELLOW_MAX_POINTS = 43
+PROGRESS_TOKENS_POINTS = 44
+BROWN = 45
+GRAY = 46
+BLUE = 47
+GREEN = 48
+YELLOW = 49
+RED = 50
+PURPLE = 51
+ARCHITECTURE = 52
+ECONOMY = 53
+MASONRY = 54
+STRATEGY = 55
+THEOLOGY = 56
+URBANISM = 57
+PROGRESS_TOKEN = 58
+
+BONUSES_COUNT = 59
+
+INSTANT_COINS = 0
+INSTANT_SHIELD = 1
+INSTANT_BROWN_COINS = 2
+INSTANT_GRAY_COINS = 3
+INSTANT_RED_COINS = 4
+INSTANT_YELLOW_COINS = 5
+INSTANT_WONDER_COINS = 6
+INSTANT_BLUE_MAX_COINS = 7
+INSTANT_BROWN_GRAY_MAX_COINS = 8
+INSTANT_GREEN_MAX_COINS = 9
+INSTANT_RED_MAX_COINS = 10
+INSTANT_YELLOW_MAX_COINS = 11
+INSTANT_OPPONENT_COINS = 12
+INSTANT_DOUBLE_TURN = 13
+INSTANT_DESTROY_BROWN = 14
+INSTANT_DESTROY_GRAY = 15
+INSTANT_SELECT_PROGRESS_TOKEN = 16
+INSTANT_SELECT_DISCARDED = 17
+
+INSTANT_BONUSES_COUNT = 18
@@ -1,21 +1,54 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
 
+from .entity_fields import bonus_vector, instant_bonus_items, invalidates_prices
 from .price import Price
-from .bonuses import BONUSES, INSTANT_BONUSES
+from .bonuses import BONUSES, INSTANT_BONUSES, CARD_COLOR_RANGE, POINTS_BONUS_RANGE
+from .bonus_indices import POINTS, PURPLE, INSTANT_SHIELD
 
 
-@dataclass
+@dataclass(frozen=True)
 class Card:
+    """
+    Immutable, shared between games. Fields after `instant_bonuses` are derived from the ones before.
+    """
+    __slots__ = ("id", "name", "price", "bonuses", "instant_bonuses", "color", "points", "shields", "bonus_vector",
+                 "bonus_items", "instant_bonus_items", "points_bonuses", "invalidates_prices")
     id: int
     name: str
     price: Price
-    bonuses: Dict[int, int] = field(default_factory=dict)
-    instant_bonuses: List[int] = field(default_factory=list)
+    bonuses: Dict[int, int]
+    instant_bonuses: Tuple[int, ...]
+    color: int
+    points: int
+    shields: int
+    bonus_vector: Tuple[int, ...]
+    bonus_items: Tuple[Tuple[int, int], ...]
+    instant_bonus_items: Tuple[Tuple[int, int], ...]
+    points_bonuses: Tuple[int, ...]
+    invalidates_prices: bool
 
-    @property
-    def points(self) -> int:
-        return self.bonuses.get(BONUSES.index("points"), 0)
+    def __reduce__(self):
+        return Card, tuple(getattr(self, x) for x in self.__slots__)
+
+    @staticmethod
+    def create(card_id: int, name: str, price: Price, bonuses: Dict[int, int], instant_bonuses: Tuple[int, ...]):
+        color = next(x for x in bonuses if CARD_COLOR_RANGE.start <= x < CARD_COLOR_RANGE.stop)
+        points_bonuses = tuple(x for x in bonuses if POINTS_BONUS_RANGE.start <= x < POINTS_BONUS_RANGE.stop) \
+            if PURPLE in bonuses else ()
+        return Card(card_id,
+                    name,
+                    price,
+                    bonuses,
+                    instant_bonuses,
+                    color,
+                    bonuses.get(POINTS, 0),
+                    instant_bonuses[INSTANT_SHIELD],
+                    bonus_vector(bonuses),
+                    tuple(bonuses.items()),
+                    instant_bonus_items(instant_bonuses),
+                    points_bonuses,
+                    invalidates_prices(bonuses))
 
     @staticmethod
     def from_dict(description: Dict[str, Any]):
@@ -33,8 +66,8 @@ class Card:
                 bonuses[BONUSES.index(effect)] = 1
             else:
                 raise ValueError
-        return Card(description["id"],
-                    description["name"],
-                    Price(description["price"]),
-                    bonuses,
-                    instant_bonuses)
+        return Card.create(description["id"],
+                           description["name"],
+                           Price(description["price"]),
+                           bonuses,
+                           tuple(instant_bonuses))
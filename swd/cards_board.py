@@ -1,6 +1,6 @@
-import random
-from typing import List, Tuple
+from typing import List, Tuple, Dict
 
+from .game_random import GameRandom
 from .states.cards_board_state import CardsBoardState
 
 CLOSED_CARD = -1
@@ -44,6 +44,32 @@ AGES = [
     ]
 ]
 
+BOARD_ROWS = 7
+BOARD_COLUMNS = 6
+
+"""
+Bitboards have bit i * BOARD_COLUMNS + j set for slot (i, j).
+A card is covered by the two cards below it, slots i * BOARD_COLUMNS + j + BOARD_COLUMNS and the next one,
+except in the last column where only the first of them exists.
+"""
+
+LAST_COLUMN_MASK = sum(1 << (i * BOARD_COLUMNS + BOARD_COLUMNS - 1) for i in range(BOARD_ROWS))
+OCCUPIED_MASKS = [sum(1 << (i * BOARD_COLUMNS + j)
+                      for i in range(BOARD_ROWS)
+                      for j in range(BOARD_COLUMNS)
+                      if mask[i][j] > 0)
+                  for mask in AGES]
+
+AGE_SLOTS = [[(i, j) for i in range(BOARD_ROWS) for j in range(BOARD_COLUMNS) if mask[i][j] > 0] for mask in AGES]
+
+AGE_CARD_IDS = [
+    list(range(23)),
+    list(range(23, 46)),
+    list(range(46, 66)),
+]
+PURPLE_CARD_IDS = list(range(66, 73))
+PURPLE_CARDS_COUNT = 3
+
 
 def card_to_string(card_id: int):
     if card_id == NO_CARD:
@@ -58,15 +84,25 @@ def card_to_string(card_id: int):
 
 class OpeningCardsProvider:
     @staticmethod
-    def get_card(pos: Tuple[int, int], state: CardsBoardState):
+    def get_card(pos: Tuple[int, int], state: CardsBoardState, rng: GameRandom):
         if state.preset is not None:
             state.card_places[pos[0]][pos[1]] = state.preset[state.age][pos[0]][pos[1]]
         elif state.card_places[pos[0]][pos[1]] == CLOSED_CARD:
-            random.shuffle(state.card_ids)
-            state.card_places[pos[0]][pos[1]] = state.card_ids.pop(0)
+            state.card_places[pos[0]][pos[1]] = OpeningCardsProvider.draw(state.card_ids, rng)
         elif state.card_places[pos[0]][pos[1]] == CLOSED_PURPLE_CARD:
-            random.shuffle(state.purple_card_ids)
-            state.card_places[pos[0]][pos[1]] = state.purple_card_ids.pop(0)
+            state.card_places[pos[0]][pos[1]] = OpeningCardsProvider.draw(state.purple_card_ids, rng)
+
+    @staticmethod
+    def draw(card_ids: List[int], rng: GameRandom) -> int:
+        """
+        Removes a uniformly random card from `card_ids` in O(1), the last card takes its place.
+        The deck isn't dealt in advance, so reseeding `rng` of a cloned state resamples all unrevealed cards.
+        """
+        index = rng.randrange(len(card_ids))
+        card_id = card_ids[index]
+        card_ids[index] = card_ids[-1]
+        card_ids.pop()
+        return card_id
 
 
 class CardsBoard:
@@ -84,7 +120,7 @@ class CardsBoard:
         return result
 
     @staticmethod
-    def generate_age(state: CardsBoardState):
+    def generate_age(state: CardsBoardState, rng: GameRandom):
         state.available_cards = None
 
         mask = AGES[state.age]
@@ -92,23 +128,15 @@ class CardsBoard:
                         for j in range(len(mask[0]))]
                        for i in range(len(mask))]
 
-        if state.age == 0:
-            card_ids = list(range(23))
-            purple_card_ids = []
-        elif state.age == 1:
-            card_ids = list(range(23, 46))
+        if state.age == 0 or state.age == 1:
+            card_ids = list(AGE_CARD_IDS[state.age])
             purple_card_ids = []
         elif state.age == 2:
-            card_ids = list(range(46, 66))
-            purple_card_ids = list(range(66, 73))
-            indices = [(i, j)
-                       for i in range(len(mask))
-                       for j in range(len(mask[0]))
-                       if mask[i][j] > 0]
-            purple_indices = random.sample(range(len(indices)), 3)
-            for index in purple_indices:
-                pos = tuple(indices[index])
-                card_places[pos[0]][pos[1]] = CLOSED_PURPLE_CARD
+            card_ids = list(AGE_CARD_IDS[state.age])
+            purple_card_ids = list(PURPLE_CARD_IDS)
+            if state.preset is None:
+                for i, j in rng.sample(AGE_SLOTS[state.age], PURPLE_CARDS_COUNT):
+                    card_places[i][j] = CLOSED_PURPLE_CARD
         else:
             raise ValueError
 
@@ -122,7 +150,10 @@ class CardsBoard:
                   if mask[i][j] == 2]
 
         for pos in places:
-            OpeningCardsProvider.get_card(pos, state)
+            OpeningCardsProvider.get_card(pos, state, rng)
+
+        state.occupied = OCCUPIED_MASKS[state.age]
+        state.card_slots = {state.card_places[i][j]: i * BOARD_COLUMNS + j for i, j in places}
 
         if state.preset is not None:
             places = [(i, j)
@@ -131,56 +162,169 @@ class CardsBoard:
                       if mask[i][j] == 1]
 
             for pos in places:
-                if state.card_places[pos[0]][pos[1]] == CLOSED_CARD and state.preset[state.age][pos[0]][pos[1]] >= 66:
+                card_id = state.preset[state.age][pos[0]][pos[1]]
+                if state.card_places[pos[0]][pos[1]] == CLOSED_CARD and \
+                        (card_id >= PURPLE_CARD_IDS[0] or card_id == CLOSED_PURPLE_CARD):
                     state.card_places[pos[0]][pos[1]] = CLOSED_PURPLE_CARD
 
+    @staticmethod
+    def deal(state: CardsBoardState,
+             card_ids: List[List[int]],
+             purple_card_ids: List[int],
+             rng: GameRandom) -> List[List[List[int]]]:
+        """
+        Samples a preset with every face-down card of the current age and all cards and guild places of the next ages.
+        `card_ids[age]` and `purple_card_ids` are the cards that can still be dealt, face-up cards keep their places.
+        Presets of the ages that are over are empty.
+        """
+        preset = []
+        for age, slots in enumerate(AGE_SLOTS):
+            if age < state.age:
+                preset.append([])
+                continue
+            places = [[NO_CARD] * BOARD_COLUMNS for _ in range(BOARD_ROWS)]
+            if age == state.age and len(state.card_places) > 0:
+                for i, j in slots:
+                    places[i][j] = state.card_places[i][j]
+                closed = [(i, j) for i, j in slots if places[i][j] == CLOSED_CARD]
+                purple = [(i, j) for i, j in slots if places[i][j] == CLOSED_PURPLE_CARD]
+            elif age == len(AGES) - 1:
+                purple = rng.sample(slots, PURPLE_CARDS_COUNT)
+                closed = [x for x in slots if x not in purple]
+            else:
+                purple = []
+                closed = slots
+            for (i, j), card_id in zip(closed, rng.sample(card_ids[age], len(closed))):
+                places[i][j] = card_id
+            for (i, j), card_id in zip(purple, rng.sample(purple_card_ids, len(purple))):
+                places[i][j] = card_id
+            preset.append(places)
+        return preset
+
+    @staticmethod
+    def index(state: CardsBoardState) -> Dict[int, int]:
+        """
+        Rebuilds the occupancy bitboard and the face-up card id to slot index if they aren't known.
+        """
+        if state.card_slots is not None:
+            return state.card_slots
+        occupied = 0
+        card_slots = {}
+        for i, row in enumerate(state.card_places):
+            for j, card_id in enumerate(row):
+                if card_id != NO_CARD:
+                    slot = i * BOARD_COLUMNS + j
+                    occupied |= 1 << slot
+                    if card_id >= 0:
+                        card_slots[card_id] = slot
+        state.occupied = occupied
+        state.card_slots = card_slots
+        return card_slots
+
+    @staticmethod
+    def remaining_cards(state: CardsBoardState) -> int:
+        """
+        Number of cards of the age left on the board, face-up or not.
+        """
+        CardsBoard.index(state)
+        return bin(state.occupied).count("1")
+
+    @staticmethod
+    def accessible(state: CardsBoardState) -> int:
+        CardsBoard.index(state)
+        occupied = state.occupied
+        return occupied & ~((occupied >> BOARD_COLUMNS) | (occupied >> (BOARD_COLUMNS + 1)) & ~LAST_COLUMN_MASK)
+
     @staticmethod
     def available_cards(state: CardsBoardState) -> List[Tuple[int, Tuple[int, int]]]:
         if state.available_cards is not None:
             return state.available_cards
         result = []
-        places = [(i, j)
-                  for i in range(len(state.card_places))
-                  for j in range(len(state.card_places[0]))
-                  if state.card_places[i][j] >= 0]
-        for pos in places:
-            is_last_row = pos[0] == len(state.card_places) - 1
-            is_last_column = pos[1] == len(state.card_places[0]) - 1
-            if is_last_row:
-                result.append((state.card_places[pos[0]][pos[1]], tuple(pos)))
-            elif state.card_places[pos[0] + 1][pos[1]] == NO_CARD:
-                if is_last_column or state.card_places[pos[0] + 1][pos[1] + 1] == NO_CARD:
-                    result.append((state.card_places[pos[0]][pos[1]], tuple(pos)))
+        card_places = state.card_places
+        accessible = CardsBoard.accessible(state)
+        while accessible:
+            bit = accessible & -accessible
+            accessible ^= bit
+            i, j = divmod(bit.bit_length() - 1, BOARD_COLUMNS)
+            card_id = card_places[i][j]
+            if card_id >= 0:
+                result.append((card_id, (i, j)))
         state.available_cards = result
         return result
 
     @staticmethod
-    def take_card(state: CardsBoardState, card_id: int):
-        pos = None
+    def take_card(state: CardsBoardState, card_id: int, rng: GameRandom):
         state.available_cards = None
-        for i in range(len(state.card_places)):
-            for j in range(len(state.card_places[0])):
-                if state.card_places[i][j] == card_id:
-                    pos = i, j
-        if len(pos) != 2:
-            print(card_id, pos)
-            print(state.card_places)
+        slot = CardsBoard.index(state).pop(card_id, None)
+        if slot is None:
             raise ValueError
-        state.card_places[pos[0]][pos[1]] = NO_CARD
-        if pos[0] > 0:
-            card_up_pos = pos[0] - 1, pos[1]
-            card_up_left_pos = pos[0] - 1, pos[1] - 1
-            card_right_pos = pos[0], pos[1] + 1
-            card_left_pos = pos[0], pos[1] - 1
-            if CardsBoard.check_pos(state, card_up_pos):
-                if CardsBoard.check_pos(state, card_right_pos):
-                    if state.card_places[card_right_pos[0]][card_right_pos[1]] == NO_CARD:
-                        OpeningCardsProvider.get_card(card_up_pos, state)
-                else:
-                    OpeningCardsProvider.get_card(card_up_pos, state)
-            if CardsBoard.check_pos(state, card_up_left_pos) and CardsBoard.check_pos(state, card_left_pos):
-                if state.card_places[card_left_pos[0]][card_left_pos[1]] == NO_CARD:
-                    OpeningCardsProvider.get_card(card_up_left_pos, state)
+        i, j = divmod(slot, BOARD_COLUMNS)
+        state.card_places[i][j] = NO_CARD
+        state.occupied &= ~(1 << slot)
+        if i > 0:
+            accessible = CardsBoard.accessible(state)
+            CardsBoard.uncover(state, i - 1, j, accessible, rng)
+            if j > 0:
+                CardsBoard.uncover(state, i - 1, j - 1, accessible, rng)
+
+    @staticmethod
+    def uncover(state: CardsBoardState, i: int, j: int, accessible: int, rng: GameRandom):
+        slot = i * BOARD_COLUMNS + j
+        if not accessible >> slot & 1 or state.card_places[i][j] >= 0:
+            return
+        OpeningCardsProvider.get_card((i, j), state, rng)
+        state.card_slots[state.card_places[i][j]] = slot
+
+    @staticmethod
+    def set_card(state: CardsBoardState, pos: Tuple[int, int], card_id: int):
+        """
+        Puts `card_id` (or a closed card, or NO_CARD) to `pos` keeping the bitboard and the index up to date.
+        """
+        i, j = pos
+        card_slots = CardsBoard.index(state)
+        previous = state.card_places[i][j]
+        if previous >= 0:
+            del card_slots[previous]
+        state.card_places[i][j] = card_id
+        slot = i * BOARD_COLUMNS + j
+        if card_id == NO_CARD:
+            state.occupied &= ~(1 << slot)
+        else:
+            state.occupied |= 1 << slot
+            if card_id >= 0:
+                card_slots[card_id] = slot
+        state.available_cards = None
+
+    @staticmethod
+    def affected_positions(pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Positions `take_card` can change: the taken card and the two cards it covers.
+        """
+        i, j = pos
+        result = [(i, j)]
+        if i > 0:
+            result.append((i - 1, j))
+            if j > 0:
+                result.append((i - 1, j - 1))
+        return result
+
+    @staticmethod
+    def uncovered_positions(state: CardsBoardState, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Face-down cards `take_card` turns over when the card at `pos` is taken, in the order it draws them.
+        """
+        CardsBoard.index(state)
+        i, j = pos
+        occupied = state.occupied
+        state.occupied = occupied & ~(1 << (i * BOARD_COLUMNS + j))
+        accessible = CardsBoard.accessible(state)
+        state.occupied = occupied
+        result = []
+        for position in CardsBoard.affected_positions(pos)[1:]:
+            if state.card_places[position[0]][position[1]] in (CLOSED_CARD, CLOSED_PURPLE_CARD) and \
+                    accessible >> (position[0] * BOARD_COLUMNS + position[1]) & 1:
+                result.append(position)
+        return result
 
     @staticmethod
     def check_pos(state: CardsBoardState, pos: Tuple[int, int]):
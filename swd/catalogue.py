@@ -0,0 +1,303 @@
+# Generated by `python -m swd.codegen` from swd/resources/*.yaml, do not edit.
+
+DESCRIPTIONS_HASH = '2b8e7f3f0bd3ff31f6572cd6cba39bdeeb9f3955436c49e88fb8eb52d18da266'
+
+CARDS = [{'id': 0, 'name': 'Lumber yard', 'color': 'brown', 'price': None, 'effect': {'wood': 1}},
+ {'id': 1, 'name': 'Logging camp', 'color': 'brown', 'price': {'coins': 1}, 'effect': {'wood': 1}},
+ {'id': 2, 'name': 'Clay pool', 'color': 'brown', 'price': None, 'effect': {'clay': 1}},
+ {'id': 3, 'name': 'Clay pit', 'color': 'brown', 'price': {'coins': 1}, 'effect': {'clay': 1}},
+ {'id': 4, 'name': 'Quarry', 'color': 'brown', 'price': None, 'effect': {'stone': 1}},
+ {'id': 5, 'name': 'Stone pit', 'color': 'brown', 'price': {'coins': 1}, 'effect': {'stone': 1}},
+ {'id': 6, 'name': 'Glassworks', 'color': 'gray', 'price': {'coins': 1}, 'effect': {'glass': 1}},
+ {'id': 7, 'name': 'Press', 'color': 'gray', 'price': {'coins': 1}, 'effect': {'paper': 1}},
+ {'id': 8, 'name': 'Guard tower', 'color': 'red', 'price': None, 'effect': {'shield': 1}},
+ {'id': 9,
+  'name': 'Stable',
+  'color': 'red',
+  'price': {'wood': 1},
+  'effect': {'shield': 1, 'chain_symbol': 'horseshoe'}},
+ {'id': 10, 'name': 'Garrison', 'color': 'red', 'price': {'clay': 1}, 'effect': {'shield': 1, 'chain_symbol': 'sword'}},
+ {'id': 11,
+  'name': 'Palisade',
+  'color': 'red',
+  'price': {'coins': 2},
+  'effect': {'shield': 1, 'chain_symbol': 'tower'}},
+ {'id': 12,
+  'name': 'Workshop',
+  'color': 'green',
+  'price': {'paper': 1},
+  'effect': {'points': 1, 'scientific_symbol': 'plumb'}},
+ {'id': 13,
+  'name': 'Apothecary',
+  'color': 'green',
+  'price': {'glass': 1},
+  'effect': {'points': 1, 'scientific_symbol': 'wheel'}},
+ {'id': 14,
+  'name': 'Scriptorium',
+  'color': 'green',
+  'price': {'coins': 2},
+  'effect': {'chain_symbol': 'book', 'scientific_symbol': 'feather'}},
+ {'id': 15,
+  'name': 'Pharmacist',
+  'color': 'green',
+  'price': {'coins': 2},
+  'effect': {'chain_symbol': 'gear', 'scientific_symbol': 'mortar_and_pestle'}},
+ {'id': 16, 'name': 'Theater', 'color': 'blue', 'price': None, 'effect': {'points': 3, 'chain_symbol': 'mask'}},
+ {'id': 17, 'name': 'Altar', 'color': 'blue', 'price': None, 'effect': {'points': 3, 'chain_symbol': 'moon'}},
+ {'id': 18, 'name': 'Baths', 'color': 'blue', 'price': {'stone': 1}, 'effect': {'points': 3, 'chain_symbol': 'drop'}},
+ {'id': 19, 'name': 'Stone reserve', 'color': 'yellow', 'price': {'coins': 3}, 'effect': {'stone_trade': 1}},
+ {'id': 20, 'name': 'Clay reserve', 'color': 'yellow', 'price': {'coins': 3}, 'effect': {'clay_trade': 1}},
+ {'id': 21, 'name': 'Wood reserve', 'color': 'yellow', 'price': {'coins': 3}, 'effect': {'wood_trade': 1}},
+ {'id': 22, 'name': 'Tavern', 'color': 'yellow', 'price': None, 'effect': {'coins': 4, 'chain_symbol': 'vase'}},
+ {'id': 23, 'name': 'Sawmill', 'color': 'brown', 'price': {'coins': 2}, 'effect': {'wood': 2}},
+ {'id': 24, 'name': 'Brickyard', 'color': 'brown', 'price': {'coins': 2}, 'effect': {'clay': 2}},
+ {'id': 25, 'name': 'Shelf quarry', 'color': 'brown', 'price': {'coins': 2}, 'effect': {'stone': 2}},
+ {'id': 26, 'name': 'Glassblower', 'color': 'gray', 'price': None, 'effect': {'glass': 1}},
+ {'id': 27, 'name': 'Drying room', 'color': 'gray', 'price': None, 'effect': {'paper': 1}},
+ {'id': 28, 'name': 'Walls', 'color': 'red', 'price': {'stone': 2}, 'effect': {'shield': 2}},
+ {'id': 29,
+  'name': 'Horse breeders',
+  'color': 'red',
+  'price': {'wood': 1, 'clay': 1, 'chain_symbol': 'horseshoe'},
+  'effect': {'shield': 1}},
+ {'id': 30,
+  'name': 'Barracks',
+  'color': 'red',
+  'price': {'coins': 3, 'chain_symbol': 'sword'},
+  'effect': {'shield': 1}},
+ {'id': 31,
+  'name': 'Archery range',
+  'color': 'red',
+  'price': {'wood': 1, 'stone': 1, 'paper': 1},
+  'effect': {'shield': 2, 'chain_symbol': 'target'}},
+ {'id': 32,
+  'name': 'Parade ground',
+  'color': 'red',
+  'price': {'clay': 2, 'glass': 1},
+  'effect': {'shield': 2, 'chain_symbol': 'helmet'}},
+ {'id': 33,
+  'name': 'Library',
+  'color': 'green',
+  'price': {'wood': 1, 'stone': 1, 'glass': 1, 'chain_symbol': 'book'},
+  'effect': {'points': 2, 'scientific_symbol': 'feather'}},
+ {'id': 34,
+  'name': 'Dispensary',
+  'color': 'green',
+  'price': {'clay': 2, 'stone': 1, 'chain_symbol': 'gear'},
+  'effect': {'points': 2, 'scientific_symbol': 'mortar_and_pestle'}},
+ {'id': 35,
+  'name': 'School',
+  'color': 'green',
+  'price': {'wood': 1, 'paper': 2},
+  'effect': {'points': 1, 'chain_symbol': 'harp', 'scientific_symbol': 'wheel'}},
+ {'id': 36,
+  'name': 'Laboratory',
+  'color': 'green',
+  'price': {'wood': 1, 'glass': 2},
+  'effect': {'points': 1, 'chain_symbol': 'teapot', 'scientific_symbol': 'plumb'}},
+ {'id': 37, 'name': 'Courthouse', 'color': 'blue', 'price': {'wood': 2, 'glass': 1}, 'effect': {'points': 5}},
+ {'id': 38,
+  'name': 'Statue',
+  'color': 'blue',
+  'price': {'clay': 2, 'chain_symbol': 'mask'},
+  'effect': {'points': 4, 'chain_symbol': 'column'}},
+ {'id': 39,
+  'name': 'Temple',
+  'color': 'blue',
+  'price': {'wood': 1, 'paper': 1, 'chain_symbol': 'moon'},
+  'effect': {'points': 4, 'chain_symbol': 'sun'}},
+ {'id': 40,
+  'name': 'Aqueduct',
+  'color': 'blue',
+  'price': {'stone': 3, 'chain_symbol': 'drop'},
+  'effect': {'points': 5}},
+ {'id': 41,
+  'name': 'Rostrum',
+  'color': 'blue',
+  'price': {'wood': 1, 'stone': 1},
+  'effect': {'points': 4, 'chain_symbol': 'temple'}},
+ {'id': 42, 'name': 'Forum', 'color': 'yellow', 'price': {'coins': 3, 'clay': 1}, 'effect': {'goods': 1}},
+ {'id': 43,
+  'name': 'Caravansery',
+  'color': 'yellow',
+  'price': {'coins': 2, 'glass': 1, 'paper': 1},
+  'effect': {'materials': 1}},
+ {'id': 44,
+  'name': 'Customs house',
+  'color': 'yellow',
+  'price': {'coins': 4},
+  'effect': {'glass_trade': 1, 'paper_trade': 1}},
+ {'id': 45, 'name': 'Brewery', 'color': 'yellow', 'price': None, 'effect': {'coins': 6, 'chain_symbol': 'barrel'}},
+ {'id': 46, 'name': 'Arsenal', 'color': 'red', 'price': {'wood': 2, 'clay': 3}, 'effect': {'shield': 3}},
+ {'id': 47, 'name': 'Pretorium', 'color': 'red', 'price': {'coins': 8}, 'effect': {'shield': 3}},
+ {'id': 48,
+  'name': 'Fortifications',
+  'color': 'red',
+  'price': {'clay': 1, 'stone': 2, 'paper': 1, 'chain_symbol': 'tower'},
+  'effect': {'shield': 2}},
+ {'id': 49,
+  'name': 'Siege workshop',
+  'color': 'red',
+  'price': {'wood': 3, 'glass': 1, 'chain_symbol': 'target'},
+  'effect': {'shield': 2}},
+ {'id': 50,
+  'name': 'Circus',
+  'color': 'red',
+  'price': {'clay': 2, 'stone': 2, 'chain_symbol': 'helmet'},
+  'effect': {'shield': 2}},
+ {'id': 51,
+  'name': 'Academy',
+  'color': 'green',
+  'price': {'wood': 1, 'stone': 1, 'glass': 2},
+  'effect': {'points': 3, 'scientific_symbol': 'sundial'}},
+ {'id': 52,
+  'name': 'Study',
+  'color': 'green',
+  'price': {'wood': 2, 'glass': 1, 'paper': 1},
+  'effect': {'points': 3, 'scientific_symbol': 'sundial'}},
+ {'id': 53,
+  'name': 'University',
+  'color': 'green',
+  'price': {'clay': 1, 'glass': 1, 'paper': 1, 'chain_symbol': 'harp'},
+  'effect': {'points': 2, 'scientific_symbol': 'armillary_sphere'}},
+ {'id': 54,
+  'name': 'Observatory',
+  'color': 'green',
+  'price': {'stone': 1, 'paper': 2, 'chain_symbol': 'teapot'},
+  'effect': {'points': 2, 'scientific_symbol': 'armillary_sphere'}},
+ {'id': 55,
+  'name': 'Palace',
+  'color': 'blue',
+  'price': {'wood': 1, 'clay': 1, 'stone': 1, 'glass': 2},
+  'effect': {'points': 7}},
+ {'id': 56, 'name': 'Town hall', 'color': 'blue', 'price': {'wood': 2, 'stone': 3}, 'effect': {'points': 7}},
+ {'id': 57, 'name': 'Obelisk', 'color': 'blue', 'price': {'stone': 2, 'glass': 1}, 'effect': {'points': 5}},
+ {'id': 58,
+  'name': 'Gardens',
+  'color': 'blue',
+  'price': {'wood': 2, 'clay': 2, 'chain_symbol': 'column'},
+  'effect': {'points': 6}},
+ {'id': 59,
+  'name': 'Pantheon',
+  'color': 'blue',
+  'price': {'wood': 1, 'clay': 1, 'paper': 2, 'chain_symbol': 'sun'},
+  'effect': {'points': 6}},
+ {'id': 60,
+  'name': 'Senate',
+  'color': 'blue',
+  'price': {'clay': 2, 'stone': 1, 'paper': 1, 'chain_symbol': 'temple'},
+  'effect': {'points': 5}},
+ {'id': 61,
+  'name': 'Chamber of commerce',
+  'color': 'yellow',
+  'price': {'paper': 2},
+  'effect': {'points': 3, 'gray_coins': 3}},
+ {'id': 62,
+  'name': 'Port',
+  'color': 'yellow',
+  'price': {'wood': 1, 'glass': 1, 'paper': 1},
+  'effect': {'points': 3, 'brown_coins': 2}},
+ {'id': 63,
+  'name': 'Armory',
+  'color': 'yellow',
+  'price': {'stone': 2, 'glass': 1},
+  'effect': {'points': 3, 'red_coins': 1}},
+ {'id': 64,
+  'name': 'Lighthouse',
+  'color': 'yellow',
+  'price': {'clay': 2, 'glass': 1, 'chain_symbol': 'vase'},
+  'effect': {'points': 3, 'yellow_coins': 1}},
+ {'id': 65,
+  'name': 'Arena',
+  'color': 'yellow',
+  'price': {'wood': 1, 'clay': 1, 'stone': 1, 'chain_symbol': 'barrel'},
+  'effect': {'points': 3, 'wonder_coins': 2}},
+ {'id': 66,
+  'name': 'Merchants guild',
+  'color': 'purple',
+  'price': {'wood': 1, 'clay': 1, 'glass': 1, 'paper': 1},
+  'effect': {'yellow_max_points': 1, 'yellow_max_coins': 1}},
+ {'id': 67,
+  'name': 'Shipowners guild',
+  'color': 'purple',
+  'price': {'clay': 1, 'stone': 1, 'glass': 1, 'paper': 1},
+  'effect': {'brown_gray_max_points': 1, 'brown_gray_max_coins': 1}},
+ {'id': 68,
+  'name': 'Builders guild',
+  'color': 'purple',
+  'price': {'wood': 1, 'clay': 1, 'stone': 2, 'glass': 1},
+  'effect': {'wonder_max_points': 2}},
+ {'id': 69,
+  'name': 'Magistrates guild',
+  'color': 'purple',
+  'price': {'wood': 2, 'clay': 1, 'paper': 1},
+  'effect': {'blue_max_points': 1, 'blue_max_coins': 1}},
+ {'id': 70,
+  'name': 'Scientists guild',
+  'color': 'purple',
+  'price': {'wood': 2, 'clay': 2},
+  'effect': {'green_max_points': 1, 'green_max_coins': 1}},
+ {'id': 71,
+  'name': 'Moneylenders guild',
+  'color': 'purple',
+  'price': {'wood': 2, 'stone': 2},
+  'effect': {'coins_max_points': 1}},
+ {'id': 72,
+  'name': 'Tacticians guild',
+  'color': 'purple',
+  'price': {'clay': 1, 'stone': 2, 'paper': 1},
+  'effect': {'red_max_points': 1, 'red_max_coins': 1}}]
+
+WONDERS = [{'id': 0,
+  'name': 'The Appian Way',
+  'price': {'clay': 2, 'stone': 2, 'paper': 1},
+  'effect': {'coins': 3, 'opponent_coins': -3, 'double_turn': 1, 'points': 3}},
+ {'id': 1,
+  'name': 'Circum Maximus',
+  'price': {'wood': 1, 'stone': 2, 'glass': 1},
+  'effect': {'destroy_gray': 1, 'shield': 1, 'points': 3}},
+ {'id': 2, 'name': 'The Colossus', 'price': {'clay': 3, 'glass': 1}, 'effect': {'shield': 2, 'points': 3}},
+ {'id': 3,
+  'name': 'The Great Library',
+  'price': {'wood': 3, 'glass': 1, 'paper': 1},
+  'effect': {'select_progress_token': 1, 'points': 4}},
+ {'id': 4,
+  'name': 'The Great Lighthouse',
+  'price': {'wood': 1, 'stone': 1, 'paper': 2},
+  'effect': {'materials': 1, 'points': 4}},
+ {'id': 5,
+  'name': 'The Hanging Gardens',
+  'price': {'wood': 2, 'glass': 1, 'paper': 1},
+  'effect': {'coins': 6, 'double_turn': 1, 'points': 3}},
+ {'id': 6,
+  'name': 'The Mausoleum',
+  'price': {'clay': 2, 'glass': 2, 'paper': 1},
+  'effect': {'select_discarded': 1, 'points': 2}},
+ {'id': 7,
+  'name': 'Piraeus',
+  'price': {'wood': 2, 'clay': 1, 'stone': 1},
+  'effect': {'goods': 1, 'double_turn': 1, 'points': 2}},
+ {'id': 8, 'name': 'The Pyramids', 'price': {'stone': 3, 'paper': 1}, 'effect': {'points': 9}},
+ {'id': 9,
+  'name': 'The Sphinx',
+  'price': {'clay': 1, 'stone': 1, 'glass': 2},
+  'effect': {'double_turn': 1, 'points': 6}},
+ {'id': 10,
+  'name': 'The Statue of Zeus',
+  'price': {'wood': 1, 'clay': 1, 'stone': 1, 'paper': 2},
+  'effect': {'destroy_brown': 1, 'shield': 1, 'points': 3}},
+ {'id': 11,
+  'name': 'The Temple of Artemis',
+  'price': {'wood': 1, 'stone': 1, 'glass': 1, 'paper': 1},
+  'effect': {'coins': 12, 'double_turn': 1}}]
+
+TOKENS = [{'name': 'agriculture', 'effect': {'coins': 6, 'points': 4}},
+ {'name': 'architecture', 'effect': {'architecture': 1}},
+ {'name': 'economy', 'effect': {'economy': 1}},
+ {'name': 'law', 'effect': {'scientific_symbol': 'law'}},
+ {'name': 'masonry', 'effect': {'masonry': 1}},
+ {'name': 'mathematics', 'effect': {'progress_tokens_points': 3}},
+ {'name': 'philosophy', 'effect': {'points': 7}},
+ {'name': 'strategy', 'effect': {'strategy': 1}},
+ {'name': 'theology', 'effect': {'theology': 1}},
+ {'name': 'urbanism', 'effect': {'coins': 6, 'urbanism': 4}}]
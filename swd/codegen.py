@@ -0,0 +1,47 @@
+import os
+import pprint
+from typing import List
+
+import yaml
+
+from .bonuses import BONUSES, INSTANT_BONUSES
+from .entity_manager import read_descriptions, descriptions_hash
+
+
+BONUS_INDICES_PATH = os.path.join(os.path.dirname(__file__), "bonus_indices.py")
+CATALOGUE_PATH = os.path.join(os.path.dirname(__file__), "catalogue.py")
+
+
+def _constants(names: List[str], prefix: str = "") -> List[str]:
+    return [f"{prefix}{name.upper()} = {index}" for index, name in enumerate(names)]
+
+
+def generate_bonus_indices() -> str:
+    lines = ["# Generated by `python -m swd.codegen` from swd/bonuses.py, do not edit.", ""]
+    lines += _constants(BONUSES)
+    lines += ["", f"BONUSES_COUNT = {len(BONUSES)}", ""]
+    lines += _constants(INSTANT_BONUSES, "INSTANT_")
+    lines += ["", f"INSTANT_BONUSES_COUNT = {len(INSTANT_BONUSES)}", ""]
+    return "\n".join(lines)
+
+
+def generate_catalogue() -> str:
+    descriptions = read_descriptions()
+    cards, wonders, tokens = [yaml.safe_load(x) for x in descriptions]
+    lines = ["# Generated by `python -m swd.codegen` from swd/resources/*.yaml, do not edit.", ""]
+    lines += [f"DESCRIPTIONS_HASH = {descriptions_hash(descriptions)!r}", ""]
+    lines += [f"CARDS = {pprint.pformat(cards, width=120, sort_dicts=False)}", ""]
+    lines += [f"WONDERS = {pprint.pformat(wonders, width=120, sort_dicts=False)}", ""]
+    lines += [f"TOKENS = {pprint.pformat(tokens, width=120, sort_dicts=False)}", ""]
+    return "\n".join(lines)
+
+
+def main():
+    with open(BONUS_INDICES_PATH, "w") as f:
+        f.write(generate_bonus_indices())
+    with open(CATALOGUE_PATH, "w") as f:
+        f.write(generate_catalogue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from typing import Dict, Iterable, Tuple
+
+from .bonuses import BONUSES, PLAYER_INVALIDATE_CACHE_RANGE, OPPONENT_INVALIDATE_CACHE_RANGE
+
+
+"""
+Derived fields shared by cards, wonders and progress tokens, computed once when entities are loaded.
+"""
+
+
+def bonus_vector(bonuses: Dict[int, int]) -> Tuple[int, ...]:
+    return tuple(bonuses.get(i, 0) for i in range(len(BONUSES)))
+
+
+def instant_bonus_items(instant_bonuses: Iterable[int]) -> Tuple[Tuple[int, int], ...]:
+    return tuple((bonus, value) for bonus, value in enumerate(instant_bonuses) if value != 0)
+
+
+def invalidates_prices(bonuses: Dict[int, int]) -> bool:
+    return any(x in PLAYER_INVALIDATE_CACHE_RANGE or x in OPPONENT_INVALIDATE_CACHE_RANGE for x in bonuses)
@@ -1,7 +1,6 @@
+import hashlib
 import importlib.resources as pkg_resources
-from typing import List
-
-import yaml
+from typing import Any, Dict, List, Tuple
 
 from .cards import Card
 from .progress_tokens import ProgressToken
@@ -15,51 +14,68 @@ WONDERS_DESCRIPTION_PATH = "wonders.yaml"
 TOKENS_DESCRIPTION_PATH = "tokens.yaml"
 
 
+def read_descriptions() -> Tuple[str, str, str]:
+    return (pkg_resources.read_text(resources, CARDS_DESCRIPTION_PATH),
+            pkg_resources.read_text(resources, WONDERS_DESCRIPTION_PATH),
+            pkg_resources.read_text(resources, TOKENS_DESCRIPTION_PATH))
+
+
+def descriptions_hash(descriptions: Tuple[str, str, str]) -> str:
+    return hashlib.sha256("\0".join(descriptions).encode()).hexdigest()
+
+
+def load_descriptions() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Entity descriptions from the generated catalogue, YAML is parsed only if it was changed after generation.
+    """
+    descriptions = read_descriptions()
+    try:
+        from . import catalogue
+        if catalogue.DESCRIPTIONS_HASH == descriptions_hash(descriptions):
+            return catalogue.CARDS, catalogue.WONDERS, catalogue.TOKENS
+    except ImportError:
+        pass
+
+    import yaml
+    cards, wonders, tokens = [yaml.safe_load(x) for x in descriptions]
+    return cards, wonders, tokens
+
+
 class EntityManager:
-    _cards = None
-    _wonders = None
-    _tokens = None
+    _cards: Tuple[Card, ...] = ()
+    _wonders: Tuple[Wonder, ...] = ()
+    _tokens: Dict[str, ProgressToken] = {}
+
+    @classmethod
+    def load(cls):
+        cards, wonders, tokens = load_descriptions()
+        cls._cards = tuple(Card.from_dict(x) for x in cards)
+        cls._wonders = tuple(Wonder.from_dict(x) for x in wonders)
+        cls._tokens = {token["name"]: ProgressToken.from_dict(token) for token in tokens}
 
     @classmethod
     def card(cls, card_id: int) -> Card:
-        if cls._cards is None:
-            cards_description = pkg_resources.read_text(resources, CARDS_DESCRIPTION_PATH)
-            cls._cards = [Card.from_dict(x) for x in yaml.safe_load(cards_description)]
         return cls._cards[card_id]
 
     @classmethod
     def cards_count(cls) -> int:
-        if cls._cards is None:
-            cards_description = pkg_resources.read_text(resources, CARDS_DESCRIPTION_PATH)
-            cls._cards = [Card.from_dict(x) for x in yaml.safe_load(cards_description)]
         return len(cls._cards)
 
     @classmethod
     def wonder(cls, wonder_id: int) -> Wonder:
-        if cls._wonders is None:
-            wonders_description = pkg_resources.read_text(resources, WONDERS_DESCRIPTION_PATH)
-            cls._wonders = [Wonder.from_dict(x) for x in yaml.safe_load(wonders_description)]
         return cls._wonders[wonder_id]
 
     @classmethod
     def wonders_count(cls) -> int:
-        if cls._wonders is None:
-            wonders_description = pkg_resources.read_text(resources, WONDERS_DESCRIPTION_PATH)
-            cls._wonders = [Wonder.from_dict(x) for x in yaml.safe_load(wonders_description)]
         return len(cls._wonders)
 
     @classmethod
     def progress_token_names(cls) -> List[str]:
-        if cls._tokens is None:
-            tokens_description = pkg_resources.read_text(resources, TOKENS_DESCRIPTION_PATH)
-            tokens = yaml.safe_load(tokens_description)
-            cls._tokens = {token["name"]: ProgressToken.from_dict(token) for token in tokens}
         return list(cls._tokens.keys())
 
     @classmethod
     def progress_token(cls, token_name: str) -> ProgressToken:
-        if cls._tokens is None:
-            tokens_description = pkg_resources.read_text(resources, TOKENS_DESCRIPTION_PATH)
-            tokens = yaml.safe_load(tokens_description)
-            cls._tokens = {token["name"]: ProgressToken.from_dict(token) for token in tokens}
         return cls._tokens[token_name]
+
+
+EntityManager.load()
@@ -1,47 +1,150 @@
-import random
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterable, Tuple
+
+import numpy as np
 
 from .entity_manager import EntityManager
+from .game_random import GameRandom
+from .action_space import ActionSpace, ACTIONS_COUNT
 from .action import PickWonderAction, Action, PickStartPlayerAction, DiscardCardAction, BuyCardAction, \
     BuildWonderAction, PickProgressTokenAction, DestroyCardAction, PickDiscardedCardAction
+from .move_generator import MoveGenerator
 from .cards import Card
-from .cards_board import CardsBoard
+from .cards_board import CardsBoard, CLOSED_CARD, CLOSED_PURPLE_CARD, AGE_CARD_IDS, PURPLE_CARD_IDS
 from .military_track import MilitaryTrack
 from .player import Player
-from .bonuses import POINTS_BONUS_RANGE, BONUSES, PLAYER_INVALIDATE_CACHE_RANGE, OPPONENT_INVALIDATE_CACHE_RANGE, \
-    INSTANT_BONUSES
+from .score import Score, CARD_POINTS, BLUE_CARD_POINTS, WONDER_POINTS, TOKEN_POINTS, BUILT_WONDERS, \
+    DISTINCT_SCIENTIFIC_SYMBOLS
+from .bonus_indices import BROWN, GRAY, BLUE, GREEN, YELLOW, RED, ECONOMY, STRATEGY, THEOLOGY, \
+    BLUE_MAX_POINTS, BROWN_GRAY_MAX_POINTS, COINS_MAX_POINTS, GREEN_MAX_POINTS, RED_MAX_POINTS, WONDER_MAX_POINTS, \
+    YELLOW_MAX_POINTS, PROGRESS_TOKENS_POINTS, PROGRESS_TOKEN, INSTANT_COINS, INSTANT_SHIELD, INSTANT_BROWN_COINS, \
+    INSTANT_GRAY_COINS, INSTANT_RED_COINS, INSTANT_YELLOW_COINS, INSTANT_WONDER_COINS, INSTANT_BLUE_MAX_COINS, \
+    INSTANT_BROWN_GRAY_MAX_COINS, INSTANT_GREEN_MAX_COINS, INSTANT_RED_MAX_COINS, INSTANT_YELLOW_MAX_COINS, \
+    INSTANT_OPPONENT_COINS, INSTANT_DOUBLE_TURN, INSTANT_DESTROY_BROWN, INSTANT_DESTROY_GRAY, \
+    INSTANT_SELECT_PROGRESS_TOKEN, INSTANT_SELECT_DISCARDED
 from .states.cards_board_state import CardsBoardState
-from .states.game_state import GameState, GameStatus
+from .states.game_state import GameState, GameStatus, VictoryType
 from .states.military_state_track import MilitaryTrackState
+from .states.moves_cache import MovesCache
 from .states.player_state import PlayerState
+from .states.price_cache import PriceCache
+from .states.undo_record import UndoRecord
 from .wonders import Wonder
+from .zobrist import Zobrist
+
+
+BONUS_COLOR_MAP = {
+    BLUE_MAX_POINTS: [BLUE],
+    BROWN_GRAY_MAX_POINTS: [BROWN, GRAY],
+    GREEN_MAX_POINTS: [GREEN],
+    RED_MAX_POINTS: [RED],
+    YELLOW_MAX_POINTS: [YELLOW],
+}
+
+OFFERED_PROGRESS_TOKENS = 3
+SECOND_DRAFT_WONDERS = 4
 
 
 class Game:
     @staticmethod
-    def create() -> GameState:
+    def create(seed: Optional[int] = None) -> GameState:
+        """
+        Games created with the same `seed` are identical given the same actions.
+        """
+        rng = GameRandom(seed)
         wonders = list(range(EntityManager.wonders_count()))
-        random.shuffle(wonders)
+        rng.shuffle(wonders)
         wonders = [x for x in wonders[:8]]
 
         tokens = EntityManager.progress_token_names()
-        random.shuffle(tokens)
-        progress_tokens = tokens[:5]
-        rest_progress_tokens = tokens[5:]
-
-        return GameState(0,
-                         0,
-                         progress_tokens,
-                         rest_progress_tokens,
-                         [],
-                         False,
-                         wonders,
-                         [PlayerState(0), PlayerState(1)],
-                         MilitaryTrackState(),
-                         GameStatus.PICK_WONDER,
-                         None,
-                         CardsBoardState(0, [], [], [], None),
-                         {})
+        rng.shuffle(tokens)
+        return Game.deal(wonders, tokens[:5], tokens[5:], None, rng)
+
+    @staticmethod
+    def deal(wonders: List[int],
+             progress_tokens: List[str],
+             rest_progress_tokens: List[str],
+             preset: Optional[List[List[List[int]]]] = None,
+             rng: Optional[GameRandom] = None) -> GameState:
+        """
+        Creates a game with the given wonders and progress tokens, with a cards board `preset` all ages are dealt
+        from it instead of `rng`.
+        """
+        state = GameState(0,
+                          0,
+                          progress_tokens,
+                          rest_progress_tokens,
+                          [],
+                          False,
+                          wonders,
+                          [PlayerState(0), PlayerState(1)],
+                          MilitaryTrackState(),
+                          GameStatus.PICK_WONDER,
+                          None,
+                          CardsBoardState(0, [], [], [], preset),
+                          {},
+                          rng=rng)
+        state.zobrist_hash = Zobrist.hash(state)
+        return state
+
+    @staticmethod
+    def random(state: GameState) -> GameRandom:
+        if state.rng is None:
+            state.rng = GameRandom()
+        return state.rng
+
+    @staticmethod
+    def determinize(state: GameState, rng: Optional[GameRandom] = None) -> GameState:
+        """
+        Returns a clone where everything the current player hasn't seen is sampled with `rng` and fixed:
+        face-down cards and the cards and guild places of the next ages become the cards board preset,
+        the rest progress tokens are shuffled. Without `rng` a generator seeded from the global `random` is used.
+        """
+        return Game.determinizations(state, 1, rng)[0]
+
+    @staticmethod
+    def determinizations(state: GameState, count: int, rng: Optional[GameRandom] = None) -> List[GameState]:
+        """
+        Returns `count` independent determinizations of `state`, unseen cards are collected once for all of them.
+        """
+        if rng is None:
+            rng = GameRandom()
+        card_ids, purple_card_ids = Game.unseen_cards(state)
+
+        result = []
+        for _ in range(count):
+            determinization = state.clone()
+            cards_board_state = determinization.cards_board_state
+            cards_board_state.preset = CardsBoard.deal(cards_board_state, card_ids, purple_card_ids, rng)
+            Game.shuffle_rest_progress_tokens(determinization, rng)
+            result.append(determinization)
+        return result
+
+    @staticmethod
+    def unseen_cards(state: GameState) -> Tuple[List[List[int]], List[int]]:
+        """
+        Cards of every age and guilds nobody has seen yet: not on the board face-up, not bought, discarded
+        or put under a wonder.
+        """
+        seen_cards = set(state.discard_pile)
+        for player_state in state.players_state:
+            seen_cards.update(player_state.cards)
+            seen_cards.update(card_id for _, card_id in player_state.wonders if card_id is not None)
+        for row in state.cards_board_state.card_places:
+            seen_cards.update(row)
+        card_ids = [[x for x in age_card_ids if x not in seen_cards] for age_card_ids in AGE_CARD_IDS]
+        purple_card_ids = [x for x in PURPLE_CARD_IDS if x not in seen_cards]
+        return card_ids, purple_card_ids
+
+    @staticmethod
+    def shuffle_rest_progress_tokens(state: GameState, rng: GameRandom):
+        """
+        Shuffles the rest progress tokens except the ones offered to the current player.
+        """
+        rest_progress_tokens = state.rest_progress_tokens
+        seen_count = OFFERED_PROGRESS_TOKENS if state.game_status == GameStatus.PICK_REST_PROGRESS_TOKEN else 0
+        unseen = rest_progress_tokens[seen_count:]
+        rng.shuffle(unseen)
+        rest_progress_tokens[seen_count:] = unseen
 
     @staticmethod
     def print(state: GameState) -> str:
@@ -59,42 +162,61 @@ class Game:
 
     @staticmethod
     def check_end_game(state: GameState) -> Optional[int]:
+        kind = Game.terminal_kind(state)
+        if kind is None:
+            return None
+        if kind == VictoryType.SCIENTIFIC:
+            return 0 if state.players_state[0].score[DISTINCT_SCIENTIFIC_SYMBOLS] >= 6 else 1
+        if kind == VictoryType.MILITARY:
+            return MilitaryTrack.military_supremacist(state.military_track_state)
+        points_0, blue_points_0 = Game.points(state, 0)
+        points_1, blue_points_1 = Game.points(state, 1)
+        if points_0 > points_1:
+            return 0
+        elif points_0 < points_1:
+            return 1
+        elif blue_points_0 > blue_points_1:
+            return 0
+        elif blue_points_0 < blue_points_1:
+            return 1
+        else:
+            return -1
+
+    @staticmethod
+    def terminal_kind(state: GameState) -> Optional[VictoryType]:
+        """
+        How the game ends in `state` or None if it goes on, in O(1) and without counting points.
+        """
         if state.game_status != GameStatus.NORMAL_TURN and state.game_status != GameStatus.FINISHED:
             return None
-        for i, player_state in enumerate(state.players_state):
-            if sum(1 for x in Player.scientific_symbols(player_state) if x > 0) >= 6:
-                return i
-        supremacist = MilitaryTrack.military_supremacist(state.military_track_state)
-        if supremacist is not None:
-            return supremacist
-        if state.age == 2 and len(CardsBoard.available_cards(state.cards_board_state)) == 0:
-            points_0, blue_points_0 = Game.points(state, 0)
-            points_1, blue_points_1 = Game.points(state, 1)
-            if points_0 > points_1:
-                return 0
-            elif points_0 < points_1:
-                return 1
-            elif blue_points_0 > blue_points_1:
-                return 0
-            elif blue_points_0 < blue_points_1:
-                return 1
-            else:
-                return -1
+        for player_state in state.players_state:
+            if player_state.score[DISTINCT_SCIENTIFIC_SYMBOLS] >= 6:
+                return VictoryType.SCIENTIFIC
+        if MilitaryTrack.military_supremacist(state.military_track_state) is not None:
+            return VictoryType.MILITARY
+        if state.age == 2 and CardsBoard.remaining_cards(state.cards_board_state) == 0:
+            return VictoryType.CIVILIAN
         return None
 
     @staticmethod
     def finish_game(state: GameState):
         state.game_status = GameStatus.FINISHED
 
+    @staticmethod
+    def offered_wonders(state: GameState) -> List[int]:
+        """
+        Wonders the current player can pick, the wonders of the second draft stay hidden during the first one.
+        """
+        if len(state.wonders) > SECOND_DRAFT_WONDERS:
+            return state.wonders[:-SECOND_DRAFT_WONDERS]
+        return state.wonders
+
     @staticmethod
     def get_available_actions(state: GameState) -> List[Action]:
         available_actions = []
 
         if state.game_status == GameStatus.PICK_WONDER:
-            if len(state.wonders) > 4:
-                available_actions = [PickWonderAction(x) for x in state.wonders[:-4]]
-            else:
-                available_actions = [PickWonderAction(x) for x in state.wonders]
+            available_actions = [PickWonderAction(x) for x in Game.offered_wonders(state)]
         elif state.game_status == GameStatus.NORMAL_TURN:
             available_actions = Game.available_normal_actions(state)
         elif state.game_status == GameStatus.PICK_START_PLAYER:
@@ -102,16 +224,17 @@ class Game:
         elif state.game_status == GameStatus.PICK_PROGRESS_TOKEN:
             available_actions = [PickProgressTokenAction(x) for x in state.progress_tokens]
         elif state.game_status == GameStatus.PICK_REST_PROGRESS_TOKEN:
-            available_actions = [PickProgressTokenAction(x) for x in state.rest_progress_tokens[:3]]
+            available_actions = [PickProgressTokenAction(x)
+                                 for x in state.rest_progress_tokens[:OFFERED_PROGRESS_TOKENS]]
         elif state.game_status == GameStatus.DESTROY_BROWN:
             opponent_state = state.players_state[1 - state.current_player_index]
             for card in Player.cards(opponent_state):
-                if BONUSES.index("brown") in card.bonuses:
+                if card.color == BROWN:
                     available_actions.append(DestroyCardAction(card.id))
         elif state.game_status == GameStatus.DESTROY_GRAY:
             opponent_state = state.players_state[1 - state.current_player_index]
             for card in Player.cards(opponent_state):
-                if BONUSES.index("gray") in card.bonuses:
+                if card.color == GRAY:
                     available_actions.append(DestroyCardAction(card.id))
         elif state.game_status == GameStatus.SELECT_DISCARDED:
             available_actions = [PickDiscardedCardAction(x) for x in state.discard_pile]
@@ -121,6 +244,15 @@ class Game:
             raise ValueError
         return available_actions
 
+    @staticmethod
+    def legal_action_mask(state: GameState, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = np.zeros(ACTIONS_COUNT, dtype=bool)
+        else:
+            out[:] = False
+        out[[ActionSpace.encode(action) for action in Game.get_available_actions(state)]] = True
+        return out
+
     @staticmethod
     def apply_military_tokens(state: GameState, player_index: int, coins: int):
         player_state = state.players_state[player_index]
@@ -128,47 +260,65 @@ class Game:
 
     @staticmethod
     def available_normal_actions(state: GameState) -> List[Action]:
-        player_state = state.players_state[state.current_player_index]
-        result: List[Action] = []
-        cards = [(EntityManager.card(x[0]), x[1]) for x in CardsBoard.available_cards(state.cards_board_state)]
-        result.extend([DiscardCardAction(x[0].id, x[1]) for x in cards])
-        for card, pos in cards:
-            price = Game.card_price(state, card, state.current_player_index)
+        if state.moves_cache is None:
+            state.moves_cache = MovesCache()
+        if state.price_cache is None:
+            state.price_cache = PriceCache()
+        cache = state.moves_cache
+        MoveGenerator.update_cards(cache, CardsBoard.available_cards(state.cards_board_state))
+
+        player_index = state.current_player_index
+        player_state = state.players_state[player_index]
+        price_version = state.price_cache.versions[player_index]
+        result = cache.actions[player_index]
+        if result is not None and cache.price_versions[player_index] == price_version and \
+                cache.coins[player_index] == player_state.coins:
+            return list(result)
+
+        result = list(cache.discard_actions)
+        for action in cache.buy_actions:
+            price = Game.card_price(state, EntityManager.card(action.card_id), player_index)
             if price <= player_state.coins:
-                result.append(BuyCardAction(card.id, pos))
+                result.append(action)
 
-        wonders_to_build = [EntityManager.wonder(x[0]) for x in player_state.wonders if x[1] is None]
-        for wonder in wonders_to_build:
-            price = Game.wonder_price(state, wonder, state.current_player_index)
+        for wonder_id, card_id in player_state.wonders:
+            if card_id is not None:
+                continue
+            price = Game.wonder_price(state, EntityManager.wonder(wonder_id), player_index)
             if price > player_state.coins:
                 continue
-            for card, pos in cards:
-                result.append(BuildWonderAction(wonder.id, card.id, pos))
+            result.extend(MoveGenerator.build_actions(cache, wonder_id))
 
-        return result
+        cache.price_versions[player_index] = price_version
+        cache.coins[player_index] = player_state.coins
+        cache.actions[player_index] = result
+        return list(result)
 
     @staticmethod
-    def apply_action(state: GameState, action: Action):
+    def apply_action(state: GameState, action: Action) -> UndoRecord:
+        """
+        Returns a record that `undo_action` uses to restore the state as it was before the action.
+        """
+        record = Game.undo_record(state, action)
+        zobrist_context = Zobrist.begin(state, action)
         player_state = state.players_state[state.current_player_index]
         if isinstance(action, BuyCardAction):
-            CardsBoard.take_card(state.cards_board_state, action.card_id)
+            CardsBoard.take_card(state.cards_board_state, action.card_id, state.rng)
             Game.buy_card(state, EntityManager.card(action.card_id))
         elif isinstance(action, DiscardCardAction):
-            CardsBoard.take_card(state.cards_board_state, action.card_id)
+            CardsBoard.take_card(state.cards_board_state, action.card_id, state.rng)
             state.discard_pile.append(action.card_id)
-            player_state.coins += 2 + player_state.bonuses[BONUSES.index("yellow")]
+            player_state.coins += 2 + player_state.bonuses[YELLOW]
         elif isinstance(action, DestroyCardAction):
             Player.destroy_card(state.players_state[1 - state.current_player_index], action.card_id)
             state.discard_pile.append(action.card_id)
-            Game.check_cache(state, EntityManager.card(action.card_id).bonuses, 1 - state.current_player_index)
+            card = EntityManager.card(action.card_id)
+            if card.invalidates_prices:
+                Game.check_cache(state, card.bonuses, 1 - state.current_player_index)
             state.game_status = GameStatus.NORMAL_TURN
         elif isinstance(action, PickWonderAction):
-            if len(state.wonders) > 4:
-                if action.wonder_id not in state.wonders[:-4]:
-                    raise ValueError
-            else:
-                if action.wonder_id not in state.wonders:
-                    raise ValueError
+            if action.wonder_id not in Game.offered_wonders(state):
+                raise ValueError
             Player.add_wonder(state.players_state[state.current_player_index], action.wonder_id)
             state.wonders.remove(action.wonder_id)
             if len(state.wonders) == 0:
@@ -178,8 +328,8 @@ class Game:
                 player_index = [0, 1, 1, 0, 1, 0, 0, 1][8 - len(state.wonders)]
                 state.current_player_index = player_index
         elif isinstance(action, BuildWonderAction):
-            CardsBoard.take_card(state.cards_board_state, action.card_id)
-            if player_state.bonuses[BONUSES.index("theology")] > 0:
+            CardsBoard.take_card(state.cards_board_state, action.card_id, state.rng)
+            if player_state.bonuses[THEOLOGY] > 0:
                 state.is_double_turn = True
             Game.build_wonder(state, action.wonder_id, action.card_id)
         elif isinstance(action, PickStartPlayerAction):
@@ -188,14 +338,15 @@ class Game:
         elif isinstance(action, PickProgressTokenAction):
             token = EntityManager.progress_token(action.progress_token)
             Player.add_progress_token(player_state, token)
-            Game.apply_instant_bonuses(state, player_state.index, token.instant_bonuses, True)
+            Game.apply_instant_bonuses(state, player_state.index, token.instant_bonus_items, True)
             if action.progress_token in state.progress_tokens:
                 state.progress_tokens.remove(action.progress_token)
             elif action.progress_token in state.rest_progress_tokens:
                 state.rest_progress_tokens.remove(action.progress_token)
             else:
                 raise ValueError
-            Game.check_cache(state, token.bonuses, state.current_player_index)
+            if token.invalidates_prices:
+                Game.check_cache(state, token.bonuses, state.current_player_index)
             state.game_status = GameStatus.NORMAL_TURN
         elif isinstance(action, PickDiscardedCardAction):
             Game.add_card(state, player_state, EntityManager.card(action.card_id))
@@ -211,11 +362,11 @@ class Game:
                 state.age = 0
                 state.current_player_index = 0
                 state.cards_board_state.age = state.age
-                CardsBoard.generate_age(state.cards_board_state)
-            elif len(CardsBoard.available_cards(state.cards_board_state)) == 0:
+                CardsBoard.generate_age(state.cards_board_state, state.rng)
+            elif CardsBoard.remaining_cards(state.cards_board_state) == 0:
                 state.age += 1
                 state.cards_board_state.age += 1
-                CardsBoard.generate_age(state.cards_board_state)
+                CardsBoard.generate_age(state.cards_board_state, state.rng)
                 state.is_double_turn = False
                 if MilitaryTrack.weaker_player(state.military_track_state) is not None:
                     state.current_player_index = MilitaryTrack.weaker_player(state.military_track_state)
@@ -227,55 +378,151 @@ class Game:
                     state.current_player_index = 1 - state.current_player_index
                 state.is_double_turn = False
 
+        Zobrist.end(state, action, zobrist_context)
+        return record
+
     @staticmethod
-    def points(state: GameState, player_index: int):
+    def undo_record(state: GameState, action: Action) -> UndoRecord:
+        players_state = state.players_state
+        military_track_state = state.military_track_state
+        price_cache = state.price_cache
+        if price_cache is not None:
+            price_cache.journal = []
+        record = UndoRecord(action,
+                            state.age,
+                            state.current_player_index,
+                            state.is_double_turn,
+                            state.game_status,
+                            state.winner,
+                            state.zobrist_hash,
+                            (players_state[0].coins, players_state[1].coins),
+                            military_track_state.conflict_pawn,
+                            military_track_state.military_tokens,
+                            price_cache.versions.copy() if price_cache is not None else None,
+                            price_cache.journal if price_cache is not None else None,
+                            Game.random(state).getstate())
+
+        cards_board_state = state.cards_board_state
+        card_places = cards_board_state.card_places
+        is_take = isinstance(action, (BuyCardAction, DiscardCardAction, BuildWonderAction))
+        available_count = len(CardsBoard.available_cards(cards_board_state))
+        if len(card_places) == 0 or available_count == 0 or is_take and available_count == 1:
+            # a new age can be generated
+            record.board_age = cards_board_state.age
+            record.card_places = [list(row) for row in card_places]
+            record.card_ids = cards_board_state.card_ids.copy()
+            record.purple_card_ids = cards_board_state.purple_card_ids.copy()
+        elif is_take:
+            record.slots = [(i, j, card_places[i][j]) for i, j in CardsBoard.affected_positions(action.pos)]
+            if any(x[2] == CLOSED_CARD or x[2] == CLOSED_PURPLE_CARD for x in record.slots):
+                record.card_ids = cards_board_state.card_ids.copy()
+                record.purple_card_ids = cards_board_state.purple_card_ids.copy()
+
+        if isinstance(action, DestroyCardAction):
+            record.index = players_state[1 - state.current_player_index].cards.index(action.card_id)
+        elif isinstance(action, PickWonderAction):
+            record.index = state.wonders.index(action.wonder_id)
+        elif isinstance(action, BuildWonderAction):
+            record.wonders = [x.wonders.copy() for x in players_state]
+        elif isinstance(action, PickProgressTokenAction):
+            record.progress_tokens = state.progress_tokens.copy()
+            record.rest_progress_tokens = state.rest_progress_tokens.copy()
+        return record
+
+    @staticmethod
+    def undo_action(state: GameState, record: UndoRecord):
+        """
+        Reverts the last applied action. Records have to be undone in reverse order and only once.
+        """
+        action = record.action
+        player_state = state.players_state[record.current_player_index]
+        opponent_state = state.players_state[1 - record.current_player_index]
+
+        cards_board_state = state.cards_board_state
+        if record.card_places is not None:
+            cards_board_state.age = record.board_age
+            cards_board_state.card_places = record.card_places
+            cards_board_state.card_ids = record.card_ids
+            cards_board_state.purple_card_ids = record.purple_card_ids
+            cards_board_state.occupied = None
+            cards_board_state.card_slots = None
+        elif record.slots is not None:
+            for i, j, card_id in record.slots:
+                CardsBoard.set_card(cards_board_state, (i, j), card_id)
+            if record.card_ids is not None:
+                cards_board_state.card_ids = record.card_ids
+                cards_board_state.purple_card_ids = record.purple_card_ids
+        cards_board_state.available_cards = None
+
+        if isinstance(action, (BuyCardAction, PickDiscardedCardAction)):
+            Player.destroy_card(player_state, action.card_id)
+        elif isinstance(action, DiscardCardAction):
+            state.discard_pile.pop()
+        elif isinstance(action, DestroyCardAction):
+            state.discard_pile.pop()
+            Player.add_card(opponent_state, EntityManager.card(action.card_id), record.index)
+        elif isinstance(action, PickWonderAction):
+            player_state.wonders.pop()
+            state.wonders.insert(record.index, action.wonder_id)
+        elif isinstance(action, BuildWonderAction):
+            Player.unbuild_wonder(player_state, action.wonder_id)
+            for x, wonders in zip(state.players_state, record.wonders):
+                x.wonders[:] = wonders
+        elif isinstance(action, PickProgressTokenAction):
+            Player.remove_progress_token(player_state, EntityManager.progress_token(action.progress_token))
+            state.progress_tokens[:] = record.progress_tokens
+            state.rest_progress_tokens[:] = record.rest_progress_tokens
+
+        state.age = record.age
+        state.current_player_index = record.current_player_index
+        state.is_double_turn = record.is_double_turn
+        state.game_status = record.game_status
+        state.winner = record.winner
+        state.zobrist_hash = record.zobrist_hash
+        for x, coins in zip(state.players_state, record.coins):
+            x.coins = coins
+        military_track_state = state.military_track_state
+        military_track_state.conflict_pawn = record.conflict_pawn
+        military_track_state.military_tokens = record.military_tokens
+        if record.price_journal is None:
+            state.price_cache = None
+        elif state.price_cache is not None:
+            state.price_cache.rollback(record.price_journal, record.price_versions)
+        state.rng.setstate(record.rng_state)
+
+    @staticmethod
+    def score(state: GameState, player_index: int) -> Score:
         player_state = state.players_state[player_index]
         opponent_state = state.players_state[1 - player_index]
+        bonuses = player_state.bonuses
+        opponent_bonuses = opponent_state.bonuses
+        score = player_state.score
+
+        guilds = 0
+        for bonus, colors in BONUS_COLOR_MAP.items():
+            if bonuses[bonus] > 0:
+                guilds += bonuses[bonus] * max(sum(bonuses[color] for color in colors),
+                                               sum(opponent_bonuses[color] for color in colors))
+        if bonuses[COINS_MAX_POINTS] > 0:
+            guilds += bonuses[COINS_MAX_POINTS] * (max(player_state.coins, opponent_state.coins) // 3)
+        if bonuses[WONDER_MAX_POINTS] > 0:
+            guilds += bonuses[WONDER_MAX_POINTS] * max(score[BUILT_WONDERS], opponent_state.score[BUILT_WONDERS])
+
+        return Score(score[CARD_POINTS],
+                     score[WONDER_POINTS],
+                     score[TOKEN_POINTS] + bonuses[PROGRESS_TOKENS_POINTS] * bonuses[PROGRESS_TOKEN],
+                     player_state.coins // 3,
+                     MilitaryTrack.points(state.military_track_state, player_index),
+                     guilds,
+                     score[BLUE_CARD_POINTS])
 
-        bonuses = state.players_state[player_index].bonuses
-
-        player_cards = [EntityManager.card(card_id) for card_id in player_state.cards]
-        player_wonders = [EntityManager.wonder(info[0]) for info in player_state.wonders if info[1] is not None]
-        opponent_wonders = [EntityManager.wonder(info[0]) for info in opponent_state.wonders if info[1] is not None]
-        player_tokens = [EntityManager.progress_token(name) for name in player_state.progress_tokens]
-
-        cards = sum([card.points for card in player_cards])
-        blue_cards = sum([card.points for card in player_cards if BONUSES.index("blue") in card.bonuses])
-        wonders = sum([wonder.points for wonder in player_wonders])
-        tokens = sum([token.points for token in player_tokens])
-        coins = player_state.coins // 3
-        military = MilitaryTrack.points(state.military_track_state, player_index)
-        bonus_points: int = 0
-        bonus_color_map = {
-            BONUSES.index("blue_max_points"): ["blue"],
-            BONUSES.index("brown_gray_max_points"): ["brown", "gray"],
-            BONUSES.index("green_max_points"): ["green"],
-            BONUSES.index("red_max_points"): ["red"],
-            BONUSES.index("yellow_max_points"): ["yellow"],
-        }
-        for card in player_cards:
-            if BONUSES.index("purple") not in card.bonuses:
-                continue
-            for bonus in card.bonuses:
-                if not (POINTS_BONUS_RANGE.start <= bonus < POINTS_BONUS_RANGE.stop):
-                    continue
-                if bonus in bonus_color_map:
-                    colors = bonus_color_map[bonus]
-                    own_cards_count = 0
-                    opponent_cards_count = 0
-                    for color in colors:
-                        own_cards_count += player_state.bonuses[BONUSES.index(color)]
-                        opponent_cards_count += opponent_state.bonuses[BONUSES.index(color)]
-                    bonus_points += max(own_cards_count, opponent_cards_count)
-                elif bonus == BONUSES.index("coins_max_points"):
-                    bonus_points += max(player_state.coins // 3, opponent_state.coins // 3)
-                elif bonus == BONUSES.index("wonder_max_points"):
-                    bonus_points += 2 * max(len(player_wonders), len(opponent_wonders))
-                else:
-                    raise ValueError
-
-        bonus_points += bonuses[BONUSES.index("progress_tokens_points")] * bonuses[BONUSES.index("progress_token")]
-        return cards + wonders + tokens + coins + military + bonus_points, blue_cards
+    @staticmethod
+    def points(state: GameState, player_index: int) -> Tuple[int, int]:
+        """
+        Total points and points of blue cards, which break ties.
+        """
+        score = Game.score(state, player_index)
+        return score.total, score.blue_cards
 
     @staticmethod
     def buy_card(state: GameState, card: Card):
@@ -286,7 +533,7 @@ class Game:
         if price > player_state.coins:
             raise ValueError
         player_state.coins -= price
-        if opponent_state.bonuses[BONUSES.index("economy")] > 0 and price > 0:
+        if opponent_state.bonuses[ECONOMY] > 0 and price > 0:
             opponent_state.coins += (price - card.price.coins)
         Game.add_card(state, player_state, card)
 
@@ -294,12 +541,13 @@ class Game:
     def add_card(state: GameState, player_state: PlayerState, card: Card):
         double_scientific_symbols = sum(x == 2 for x in Player.scientific_symbols(player_state))
         Player.add_card(player_state, card)
-        Game.apply_instant_bonuses(state, player_state.index, card.instant_bonuses, True)
+        Game.apply_instant_bonuses(state, player_state.index, card.instant_bonus_items, True)
         if double_scientific_symbols != sum(x == 2 for x in Player.scientific_symbols(player_state)):
             if len(state.progress_tokens) > 0:
                 state.game_status = GameStatus.PICK_PROGRESS_TOKEN
 
-        Game.check_cache(state, card.bonuses, state.current_player_index)
+        if card.invalidates_prices:
+            Game.check_cache(state, card.bonuses, state.current_player_index)
 
     @staticmethod
     def build_wonder(state: GameState, wonder_id: int, card_id: int):
@@ -310,70 +558,71 @@ class Game:
         if price > player_state.coins:
             raise ValueError
         player_state.coins -= price
-        if opponent_state.bonuses[BONUSES.index("economy")] > 0:
+        if opponent_state.bonuses[ECONOMY] > 0:
             opponent_state.coins += (price - wonder.price.coins)
         Player.build_wonder(player_state, wonder_id, card_id)
-        Game.apply_instant_bonuses(state, state.current_player_index, wonder.instant_bonuses, False)
+        Game.apply_instant_bonuses(state, state.current_player_index, wonder.instant_bonus_items, False)
 
         if len([x for x in player_state.wonders if x[1] is not None]) + \
                 len([x for x in opponent_state.wonders if x[1] is not None]) == 7:
             Player.remove_unbuilt_wonders(player_state)
             Player.remove_unbuilt_wonders(opponent_state)
 
-        Game.check_cache(state, wonder.bonuses, state.current_player_index)
+        if wonder.invalidates_prices:
+            Game.check_cache(state, wonder.bonuses, state.current_player_index)
 
     @staticmethod
-    def apply_instant_bonuses(state: GameState, player_index: int, instant_bonuses: List[int], is_card: bool):
+    def apply_instant_bonuses(state: GameState,
+                              player_index: int,
+                              instant_bonus_items: Iterable[Tuple[int, int]],
+                              is_card: bool):
         player_state = state.players_state[player_index]
         opponent_state = state.players_state[1 - player_index]
-        for bonus, value in enumerate(instant_bonuses):
-            if value == 0:
-                continue
-            if bonus == INSTANT_BONUSES.index("coins"):
+        for bonus, value in instant_bonus_items:
+            if bonus == INSTANT_COINS:
                 player_state.coins += value
-            elif bonus == INSTANT_BONUSES.index("shield"):
-                if is_card and player_state.bonuses[BONUSES.index("strategy")] > 0:
+            elif bonus == INSTANT_SHIELD:
+                if is_card and player_state.bonuses[STRATEGY] > 0:
                     value += 1
                 MilitaryTrack.apply_shields(state.military_track_state,
                                             player_index,
                                             value,
                                             lambda x, y: Game.apply_military_tokens(state, x, y))
-            elif bonus == INSTANT_BONUSES.index("brown_coins"):
-                player_state.coins += value * player_state.bonuses[BONUSES.index("brown")]
-            elif bonus == INSTANT_BONUSES.index("gray_coins"):
-                player_state.coins += value * player_state.bonuses[BONUSES.index("gray")]
-            elif bonus == INSTANT_BONUSES.index("red_coins"):
-                player_state.coins += value * player_state.bonuses[BONUSES.index("red")]
-            elif bonus == INSTANT_BONUSES.index("yellow_coins"):
-                player_state.coins += value * player_state.bonuses[BONUSES.index("yellow")]
-            elif bonus == INSTANT_BONUSES.index("wonder_coins"):
+            elif bonus == INSTANT_BROWN_COINS:
+                player_state.coins += value * player_state.bonuses[BROWN]
+            elif bonus == INSTANT_GRAY_COINS:
+                player_state.coins += value * player_state.bonuses[GRAY]
+            elif bonus == INSTANT_RED_COINS:
+                player_state.coins += value * player_state.bonuses[RED]
+            elif bonus == INSTANT_YELLOW_COINS:
+                player_state.coins += value * player_state.bonuses[YELLOW]
+            elif bonus == INSTANT_WONDER_COINS:
                 player_state.coins += value * len([x for x in player_state.wonders if x[1] is not None])
-            elif bonus == INSTANT_BONUSES.index("blue_max_coins"):
-                player_state.coins += value * max(x.bonuses[BONUSES.index("blue")] for x in state.players_state)
-            elif bonus == INSTANT_BONUSES.index("brown_gray_max_coins"):
-                player_state.coins += value * max(x.bonuses[BONUSES.index("brown")] +
-                                                  x.bonuses[BONUSES.index("gray")]
+            elif bonus == INSTANT_BLUE_MAX_COINS:
+                player_state.coins += value * max(x.bonuses[BLUE] for x in state.players_state)
+            elif bonus == INSTANT_BROWN_GRAY_MAX_COINS:
+                player_state.coins += value * max(x.bonuses[BROWN] +
+                                                  x.bonuses[GRAY]
                                                   for x in state.players_state)
-            elif bonus == INSTANT_BONUSES.index("green_max_coins"):
-                player_state.coins += value * max(x.bonuses[BONUSES.index("green")] for x in state.players_state)
-            elif bonus == INSTANT_BONUSES.index("red_max_coins"):
-                player_state.coins += value * max(x.bonuses[BONUSES.index("red")] for x in state.players_state)
-            elif bonus == INSTANT_BONUSES.index("yellow_max_coins"):
-                player_state.coins += value * max(x.bonuses[BONUSES.index("yellow")] for x in state.players_state)
-            elif bonus == INSTANT_BONUSES.index("opponent_coins"):
+            elif bonus == INSTANT_GREEN_MAX_COINS:
+                player_state.coins += value * max(x.bonuses[GREEN] for x in state.players_state)
+            elif bonus == INSTANT_RED_MAX_COINS:
+                player_state.coins += value * max(x.bonuses[RED] for x in state.players_state)
+            elif bonus == INSTANT_YELLOW_MAX_COINS:
+                player_state.coins += value * max(x.bonuses[YELLOW] for x in state.players_state)
+            elif bonus == INSTANT_OPPONENT_COINS:
                 opponent_state.coins = max(opponent_state.coins + value, 0)
-            elif bonus == INSTANT_BONUSES.index("double_turn"):
+            elif bonus == INSTANT_DOUBLE_TURN:
                 state.is_double_turn = True
-            elif bonus == INSTANT_BONUSES.index("destroy_brown"):
-                if opponent_state.bonuses[BONUSES.index("brown")] > 0:
+            elif bonus == INSTANT_DESTROY_BROWN:
+                if opponent_state.bonuses[BROWN] > 0:
                     state.game_status = GameStatus.DESTROY_BROWN
-            elif bonus == INSTANT_BONUSES.index("destroy_gray"):
-                if opponent_state.bonuses[BONUSES.index("gray")] > 0:
+            elif bonus == INSTANT_DESTROY_GRAY:
+                if opponent_state.bonuses[GRAY] > 0:
                     state.game_status = GameStatus.DESTROY_GRAY
-            elif bonus == INSTANT_BONUSES.index("select_progress_token"):
-                random.shuffle(state.rest_progress_tokens)
+            elif bonus == INSTANT_SELECT_PROGRESS_TOKEN:
                 state.game_status = GameStatus.PICK_REST_PROGRESS_TOKEN
-            elif bonus == INSTANT_BONUSES.index("select_discarded"):
+            elif bonus == INSTANT_SELECT_DISCARDED:
                 if len(state.discard_pile) > 0:
                     state.game_status = GameStatus.SELECT_DISCARDED
 
@@ -384,13 +633,11 @@ class Game:
 
         price = None
         if state.price_cache is not None:
-            price = state.price_cache.get(player_index, {}).get(card.id, None)
+            price = state.price_cache.get(player_index, card.id)
         if price is None:
             price = Player.card_price(player_state, card, opponent_state)
             if state.price_cache is not None:
-                if player_index not in state.price_cache:
-                    state.price_cache[player_index] = {}
-                state.price_cache[player_index][card.id] = price
+                state.price_cache.put(player_index, card.id, price)
 
         return price
 
@@ -401,13 +648,11 @@ class Game:
 
         price = None
         if state.price_cache is not None:
-            price = state.price_cache.get(player_index, {}).get(EntityManager.cards_count() + wonder.id, None)
+            price = state.price_cache.get(player_index, EntityManager.cards_count() + wonder.id)
         if price is None:
             price = Player.wonder_price(player_state, wonder, opponent_state)
             if state.price_cache is not None:
-                if player_index not in state.price_cache:
-                    state.price_cache[player_index] = {}
-                state.price_cache[player_index][EntityManager.cards_count() + wonder.id] = price
+                state.price_cache.put(player_index, EntityManager.cards_count() + wonder.id, price)
 
         return price
 
@@ -416,7 +661,4 @@ class Game:
         if state.price_cache is None:
             return
 
-        if any(key in PLAYER_INVALIDATE_CACHE_RANGE for key in bonuses):
-            state.price_cache[player_index] = {}
-        if any(key in OPPONENT_INVALIDATE_CACHE_RANGE for key in bonuses):
-            state.price_cache[1 - player_index] = {}
+        state.price_cache.invalidate(player_index, bonuses)
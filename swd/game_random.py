@@ -0,0 +1,81 @@
+import random
+from typing import Any, List, MutableSequence, Optional, Sequence
+
+
+MASK = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+class GameRandom:
+    """
+    SplitMix64 generator with the part of the `random.Random` interface the engine uses.
+    The whole state is one int, so games clone it and undo records save it for free.
+    Without a seed the generator is seeded from the global `random`, so `random.seed` still reproduces games.
+    """
+    __slots__ = ("state",)
+
+    def __init__(self, seed: Optional[int] = None):
+        self.state = 0
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.state = seed & MASK
+
+    def getstate(self) -> int:
+        return self.state
+
+    def setstate(self, state: int):
+        self.state = state
+
+    def clone(self) -> 'GameRandom':
+        result = GameRandom.__new__(GameRandom)
+        result.state = self.state
+        return result
+
+    def next(self) -> int:
+        self.state = state = (self.state + GOLDEN_GAMMA) & MASK
+        state = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+        state = ((state ^ (state >> 27)) * 0x94D049BB133111EB) & MASK
+        return state ^ (state >> 31)
+
+    def getrandbits(self, k: int) -> int:
+        if not 0 < k <= 64:
+            raise ValueError
+        return self.next() >> (64 - k)
+
+    def randrange(self, n: int) -> int:
+        """
+        Uniform int in [0, n) by Lemire's multiply and shift, the rare biased draws are rejected.
+        """
+        if not 0 < n <= MASK:
+            raise ValueError
+        product = self.next() * n
+        if product & MASK < n:
+            threshold = (MASK + 1 - n) % n
+            while product & MASK < threshold:
+                product = self.next() * n
+        return product >> 64
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        if len(seq) == 0:
+            raise IndexError
+        return seq[self.randrange(len(seq))]
+
+    def shuffle(self, x: MutableSequence[Any]):
+        for i in reversed(range(1, len(x))):
+            j = self.randrange(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+    def sample(self, population: Sequence[Any], k: int) -> List[Any]:
+        pool = list(population)
+        n = len(pool)
+        if not 0 <= k <= n:
+            raise ValueError
+        result = []
+        for i in range(k):
+            j = self.randrange(n - i)
+            result.append(pool[j])
+            pool[j] = pool[n - i - 1]
+        return result
@@ -0,0 +1,274 @@
+import mmap
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .action import Action
+from .action_space import TOKEN_INDICES, TOKEN_NAMES
+from .cards_board import AGE_SLOTS, BOARD_ROWS, BOARD_COLUMNS, CLOSED_CARD, NO_CARD
+from .game import Game
+from .game_random import GameRandom, MASK
+from .states.game_state import GameState
+
+
+"""
+A records file starts with MAGIC and VERSION followed by records, every record is its varint length and:
+varint seed + 1 or 0 without a seed
+8 bytes - wonders in the order they are dealt
+10 bytes - progress tokens on the board and then the rest, as indices in EntityManager.progress_token_names()
+60 bytes - cards in AGE_SLOTS of every age, 255 (CLOSED_CARD) or 254 (CLOSED_PURPLE_CARD) if never revealed
+varint number of actions, varint index of every action in Game.get_available_actions
+Actions are mostly one byte, so a game takes about 150 bytes.
+An index file is the little endian uint64 offsets of the records in the records file.
+"""
+
+MAGIC = b"SWDR"
+VERSION = 1
+HEADER_SIZE = len(MAGIC) + 1
+DEALT_WONDERS = 8
+DEALT_PROGRESS_TOKENS = 5
+INDEX_DTYPE = np.dtype("<u8")
+
+
+def write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: Union[bytes, mmap.mmap], offset: int) -> Tuple[int, int]:
+    """
+    Returns the value and the offset after it.
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+@dataclass
+class GameRecord:
+    """
+    Everything needed to replay a game: the deal, the cards of every age as they were revealed and the actions.
+    Replays go through the cards board preset, so they reproduce the game without the generator.
+    """
+    seed: Optional[int]
+    wonders: List[int]
+    progress_tokens: List[str]
+    layouts: List[List[int]]
+    actions: List[int]
+
+    @staticmethod
+    def create(state: GameState, seed: Optional[int] = None) -> 'GameRecord':
+        """
+        Starts a record of a new game, call `append` before every action and `finish` when the game is over.
+        """
+        if len(state.wonders) != DEALT_WONDERS or len(state.progress_tokens) != DEALT_PROGRESS_TOKENS:
+            raise ValueError
+        return GameRecord(seed,
+                          state.wonders.copy(),
+                          state.progress_tokens + state.rest_progress_tokens,
+                          [[CLOSED_CARD] * len(slots) for slots in AGE_SLOTS],
+                          [])
+
+    def append(self, state: GameState, action: Action):
+        self.observe(state)
+        self.actions.append(Game.get_available_actions(state).index(action))
+
+    def finish(self, state: GameState):
+        self.observe(state)
+
+    def observe(self, state: GameState):
+        cards_board_state = state.cards_board_state
+        card_places = cards_board_state.card_places
+        if len(card_places) == 0:
+            return
+        layout = self.layouts[cards_board_state.age]
+        for k, (i, j) in enumerate(AGE_SLOTS[cards_board_state.age]):
+            card_id = card_places[i][j]
+            if card_id != NO_CARD and layout[k] < 0:
+                layout[k] = card_id
+
+    def initial_state(self) -> GameState:
+        preset = []
+        for slots, layout in zip(AGE_SLOTS, self.layouts):
+            places = [[NO_CARD] * BOARD_COLUMNS for _ in range(BOARD_ROWS)]
+            for (i, j), card_id in zip(slots, layout):
+                places[i][j] = card_id
+            preset.append(places)
+        return Game.deal(self.wonders.copy(),
+                         self.progress_tokens[:DEALT_PROGRESS_TOKENS],
+                         self.progress_tokens[DEALT_PROGRESS_TOKENS:],
+                         preset,
+                         GameRandom(self.seed))
+
+    def replay(self) -> Iterator[Tuple[GameState, Action]]:
+        """
+        Yields the state before every action and the action, the same state is then changed by the action.
+        """
+        state = self.initial_state()
+        for index in self.actions:
+            action = Game.get_available_actions(state)[index]
+            yield state, action
+            Game.apply_action(state, action)
+
+    def final_state(self) -> GameState:
+        state = self.initial_state()
+        for index in self.actions:
+            Game.apply_action(state, Game.get_available_actions(state)[index])
+        return state
+
+    def encode(self) -> bytes:
+        result = bytearray()
+        write_varint(result, 0 if self.seed is None else (self.seed & MASK) + 1)
+        result.extend(self.wonders)
+        result.extend(TOKEN_INDICES[name] for name in self.progress_tokens)
+        for layout in self.layouts:
+            result.extend(card_id & 0xFF for card_id in layout)
+        write_varint(result, len(self.actions))
+        for index in self.actions:
+            write_varint(result, index)
+        return bytes(result)
+
+    @staticmethod
+    def decode(data: Union[bytes, mmap.mmap], offset: int = 0) -> Tuple['GameRecord', int]:
+        """
+        Decodes a record without its length starting at `offset`, returns the record and the offset after it.
+        """
+        seed, offset = read_varint(data, offset)
+        wonders = list(data[offset:offset + DEALT_WONDERS])
+        offset += DEALT_WONDERS
+        progress_tokens = [TOKEN_NAMES[x] for x in data[offset:offset + len(TOKEN_NAMES)]]
+        offset += len(TOKEN_NAMES)
+        layouts = []
+        for slots in AGE_SLOTS:
+            layouts.append([x if x < 0x80 else x - 0x100 for x in data[offset:offset + len(slots)]])
+            offset += len(slots)
+        count, offset = read_varint(data, offset)
+        actions = []
+        for _ in range(count):
+            index, offset = read_varint(data, offset)
+            actions.append(index)
+        return GameRecord(seed - 1 if seed > 0 else None, wonders, progress_tokens, layouts, actions), offset
+
+
+class GameRecordWriter:
+    """
+    Appends length prefixed records to `stream`, the header is written if the stream is empty.
+    With `index_stream` the offset of every record is written to it as well.
+    """
+    stream: BinaryIO
+    index_stream: Optional[BinaryIO]
+    offset: int
+
+    def __init__(self, stream: BinaryIO, index_stream: Optional[BinaryIO] = None):
+        self.stream = stream
+        self.index_stream = index_stream
+        self.offset = stream.tell() if stream.seekable() else 0
+        if self.offset == 0:
+            stream.write(MAGIC + bytes([VERSION]))
+            self.offset = HEADER_SIZE
+
+    def write(self, record: GameRecord):
+        data = record.encode()
+        prefix = bytearray()
+        write_varint(prefix, len(data))
+        self.stream.write(prefix)
+        self.stream.write(data)
+        if self.index_stream is not None:
+            self.index_stream.write(self.offset.to_bytes(INDEX_DTYPE.itemsize, "little"))
+        self.offset += len(prefix) + len(data)
+
+    def flush(self):
+        self.stream.flush()
+        if self.index_stream is not None:
+            self.index_stream.flush()
+
+
+def read_records(stream: BinaryIO) -> Iterator[GameRecord]:
+    """
+    Reads records one by one from a stream that can't be memory-mapped, like a pipe.
+    """
+    if stream.read(HEADER_SIZE) != MAGIC + bytes([VERSION]):
+        raise ValueError
+    while True:
+        prefix = bytearray()
+        while True:
+            byte = stream.read(1)
+            if len(byte) == 0:
+                if len(prefix) > 0:
+                    raise ValueError
+                return
+            prefix += byte
+            if byte[0] < 0x80:
+                break
+        length, _ = read_varint(prefix, 0)
+        data = stream.read(length)
+        if len(data) != length:
+            raise ValueError
+        yield GameRecord.decode(data)[0]
+
+
+class GameRecordReader:
+    """
+    Memory-mapped records file with random access by game index.
+    Offsets are loaded from `index_path` if it's given, otherwise they are found by skipping over record lengths.
+    """
+    offsets: np.ndarray
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:HEADER_SIZE] != MAGIC + bytes([VERSION]):
+            self.close()
+            raise ValueError
+        if index_path is not None:
+            self.offsets = np.fromfile(index_path, dtype=INDEX_DTYPE)
+        else:
+            self.offsets = self.scan()
+
+    def scan(self) -> np.ndarray:
+        offsets = []
+        offset = HEADER_SIZE
+        size = len(self.data)
+        while offset < size:
+            offsets.append(offset)
+            length, offset = read_varint(self.data, offset)
+            offset += length
+        return np.array(offsets, dtype=INDEX_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        _, offset = read_varint(self.data, int(self.offsets[index]))
+        return GameRecord.decode(self.data, offset)[0]
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset = HEADER_SIZE
+        size = len(self.data)
+        while offset < size:
+            _, offset = read_varint(self.data, offset)
+            record, offset = GameRecord.decode(self.data, offset)
+            yield record
+
+    def replay(self) -> Iterator[Tuple[GameState, Action]]:
+        for record in self:
+            yield from record.replay()
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self) -> 'GameRecordReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,167 @@
+import math
+import random
+import time
+from typing import Callable, Dict, Optional, Sequence, List
+
+from .action import Action
+from .action_space import ActionSpace
+from .agents import Agent
+from .game import Game
+from .states.game_state import GameState
+from .transposition_table import TranspositionTable
+
+
+RolloutPolicy = Callable[[GameState], Action]
+
+
+def random_rollout(state: GameState) -> Action:
+    return random.choice(Game.get_available_actions(state))
+
+
+class Node:
+    __slots__ = ("player_index", "visits", "availability", "value", "children")
+
+    def __init__(self, player_index: int):
+        self.player_index = player_index
+        self.visits = 0
+        self.availability = 0
+        self.value = 0.0
+        self.children: Dict[int, 'Node'] = {}
+
+    def ucb(self, exploration: float) -> float:
+        return self.value / self.visits + exploration * math.sqrt(math.log(self.availability) / self.visits)
+
+
+class MCTSAgent(Agent):
+    """
+    Information set MCTS with UCT selection.
+    Every iteration searches a new determinization of the current state, nodes are keyed by action ids,
+    so children unavailable in a determinization are skipped and `availability` counts replace parent visits.
+    Node values are stored for the player who made the move leading to the node: 1 for a win, 0.5 for a draw.
+    With a transposition table new nodes are looked up by the Zobrist hash of the state they lead to,
+    so move orders reaching the same position share statistics.
+    """
+    iterations: Optional[int]
+    time_limit: Optional[float]
+    exploration: float
+    rollout_policy: RolloutPolicy
+    root: Optional[Node]
+    transposition_table: Optional[TranspositionTable]
+
+    def __init__(self,
+                 iterations: Optional[int] = 1000,
+                 time_limit: Optional[float] = None,
+                 exploration: float = 0.7,
+                 rollout_policy: RolloutPolicy = random_rollout,
+                 reuse_tree: bool = True,
+                 transposition_table: Optional[TranspositionTable] = None):
+        super().__init__()
+        if iterations is None and time_limit is None:
+            raise ValueError
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.reuse_tree = reuse_tree
+        self.transposition_table = transposition_table
+        self.root = None
+        self._chosen_action = None
+
+    def choose_action(self, state: GameState, possible_actions: Sequence[Action]) -> Action:
+        if len(possible_actions) == 1:
+            self._chosen_action = possible_actions[0]
+            return possible_actions[0]
+        if self.root is None or not self.reuse_tree or self._chosen_action is not None:
+            self.root = Node(1 - state.current_player_index)
+
+        self.search(state)
+
+        action_ids = [ActionSpace.encode(action) for action in possible_actions]
+        visits = [self.root.children[x].visits if x in self.root.children else 0 for x in action_ids]
+        action = possible_actions[max(range(len(possible_actions)), key=lambda i: visits[i])]
+        self._chosen_action = action
+        return action
+
+    def on_action_applied(self, action: Action, new_state: GameState):
+        if self._chosen_action is not None and self._chosen_action != action:
+            self.root = None
+        self._chosen_action = None
+        if self.root is not None:
+            self.root = self.root.children.get(ActionSpace.encode(action))
+
+    def search(self, state: GameState):
+        if self.transposition_table is not None:
+            self.transposition_table.new_generation()
+        start = time.perf_counter()
+        iteration = 0
+        while iteration == 0 or \
+                (self.iterations is None or iteration < self.iterations) and \
+                (self.time_limit is None or time.perf_counter() - start < self.time_limit):
+            self.iterate(Game.determinize(state))
+            iteration += 1
+
+    def iterate(self, state: GameState):
+        path = self.select(state)
+        MCTSAgent.backpropagate(path, self.rollout(state))
+
+    def select(self, state: GameState, virtual_loss: int = 0) -> List[Node]:
+        """
+        Descends from the root applying actions to `state` and expands one node.
+        `virtual_loss` visits without value are added to every node on the path until it's backpropagated.
+        """
+        node = self.root
+        node.visits += virtual_loss
+        path = [node]
+        while not Game.is_finished(state):
+            actions = Game.get_available_actions(state)
+            untried: List[Action] = []
+            best: Optional[Node] = None
+            best_action: Optional[Action] = None
+            best_ucb = -math.inf
+            for action in actions:
+                child = node.children.get(ActionSpace.encode(action))
+                if child is None:
+                    untried.append(action)
+                    continue
+                child.availability += 1
+                ucb = child.ucb(self.exploration)
+                if ucb > best_ucb:
+                    best, best_action, best_ucb = child, action, ucb
+            if len(untried) > 0:
+                action = random.choice(untried)
+                player_index = state.current_player_index
+                Game.apply_action(state, action)
+                child = self.transposed(state, player_index, len(path))
+                child.availability += 1
+                child.visits += virtual_loss
+                node.children[ActionSpace.encode(action)] = child
+                path.append(child)
+                break
+            node = best
+            node.visits += virtual_loss
+            Game.apply_action(state, best_action)
+            path.append(node)
+        return path
+
+    def transposed(self, state: GameState, player_index: int, depth: int) -> Node:
+        if self.transposition_table is None or state.zobrist_hash is None:
+            return Node(player_index)
+        node = self.transposition_table.get(state.zobrist_hash)
+        if node is None or node.player_index != player_index:
+            node = Node(player_index)
+            self.transposition_table.put(state.zobrist_hash, node, depth)
+        return node
+
+    def rollout(self, state: GameState) -> int:
+        while not Game.is_finished(state):
+            Game.apply_action(state, self.rollout_policy(state))
+        return state.winner
+
+    @staticmethod
+    def backpropagate(path: List[Node], winner: int, virtual_loss: int = 0):
+        for node in path:
+            node.visits += 1 - virtual_loss
+            if winner == node.player_index:
+                node.value += 1
+            elif winner == -1:
+                node.value += 0.5
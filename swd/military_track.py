@@ -1,6 +1,52 @@
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Tuple
 
-from .states.military_state_track import MilitaryTrackState
+from .states.military_state_track import MilitaryTrackState, MILITARY_TOKENS_COUNT
+
+
+"""
+Military tokens as (token index, pawn position that takes it, player who loses coins, coins).
+"""
+MILITARY_TOKENS = [
+    (2, 3, 1, 2),
+    (3, 6, 1, 5),
+    (1, -3, 0, 2),
+    (0, -6, 0, 5),
+]
+
+MAX_PAWN = 9
+MAX_SHIELDS = 2 * MAX_PAWN
+
+# (new pawn, new tokens, player who loses coins, coins lost)
+Transition = Tuple[int, int, int, int]
+
+
+def _transition(pawn: int, tokens: int, shields: int, player_index: int) -> Transition:
+    if player_index == 1:
+        shields = -shields
+    pawn = min(max(pawn + shields, -MAX_PAWN), MAX_PAWN)
+    loser = -1
+    coins = 0
+    for token_index, position, token_loser, token_coins in MILITARY_TOKENS:
+        taken = pawn >= position if position > 0 else pawn <= position
+        if taken and tokens >> token_index & 1:
+            tokens &= ~(1 << token_index)
+            loser = token_loser
+            coins += token_coins
+    return pawn, tokens, loser, coins
+
+
+def _index(pawn: int, tokens: int, shields: int, player_index: int) -> int:
+    return ((player_index * (2 * MAX_PAWN + 1) + pawn + MAX_PAWN) << MILITARY_TOKENS_COUNT | tokens) * \
+        (MAX_SHIELDS + 1) + shields
+
+
+TRANSITIONS: List[Transition] = [
+    _transition(pawn, tokens, shields, player_index)
+    for player_index in range(2)
+    for pawn in range(-MAX_PAWN, MAX_PAWN + 1)
+    for tokens in range(1 << MILITARY_TOKENS_COUNT)
+    for shields in range(MAX_SHIELDS + 1)
+]
 
 
 class MilitaryTrack:
@@ -9,22 +55,13 @@ class MilitaryTrack:
                       player_index: int,
                       shields: int,
                       military_tokens_callback: Callable[[int, int], None]):
-        if player_index == 1:
-            shields = -shields
-        state.conflict_pawn = min(max(state.conflict_pawn + shields, -9), 9)
-
-        if state.conflict_pawn >= 3 and state.military_tokens[2]:
-            state.military_tokens[2] = False
-            military_tokens_callback(1, -2)
-        if state.conflict_pawn >= 6 and state.military_tokens[3]:
-            state.military_tokens[3] = False
-            military_tokens_callback(1, -5)
-        if state.conflict_pawn <= -3 and state.military_tokens[1]:
-            state.military_tokens[1] = False
-            military_tokens_callback(0, -2)
-        if state.conflict_pawn <= -6 and state.military_tokens[0]:
-            state.military_tokens[0] = False
-            military_tokens_callback(0, -5)
+        shields = min(shields, MAX_SHIELDS)
+        pawn, tokens, loser, coins = \
+            TRANSITIONS[_index(state.conflict_pawn, state.military_tokens, shields, player_index)]
+        state.conflict_pawn = pawn
+        state.military_tokens = tokens
+        if coins > 0:
+            military_tokens_callback(loser, -coins)
 
     @staticmethod
     def military_supremacist(state: MilitaryTrackState) -> Optional[int]:
@@ -0,0 +1,55 @@
+from typing import List, Tuple, Dict
+
+from .action import DiscardCardAction, BuyCardAction, BuildWonderAction
+from .states.moves_cache import MovesCache
+
+
+_discard_actions: Dict[Tuple[int, Tuple[int, int]], DiscardCardAction] = {}
+_buy_actions: Dict[Tuple[int, Tuple[int, int]], BuyCardAction] = {}
+_build_actions: Dict[Tuple[int, int, Tuple[int, int]], BuildWonderAction] = {}
+
+
+class MoveGenerator:
+    """
+    Interned normal turn actions and the board part of `MovesCache`.
+    Action objects are shared between calls and games, so callers must not mutate them.
+    """
+
+    @staticmethod
+    def discard_action(card_id: int, pos: Tuple[int, int]) -> DiscardCardAction:
+        action = _discard_actions.get((card_id, pos))
+        if action is None:
+            action = _discard_actions[card_id, pos] = DiscardCardAction(card_id, pos)
+        return action
+
+    @staticmethod
+    def buy_action(card_id: int, pos: Tuple[int, int]) -> BuyCardAction:
+        action = _buy_actions.get((card_id, pos))
+        if action is None:
+            action = _buy_actions[card_id, pos] = BuyCardAction(card_id, pos)
+        return action
+
+    @staticmethod
+    def build_action(wonder_id: int, card_id: int, pos: Tuple[int, int]) -> BuildWonderAction:
+        action = _build_actions.get((wonder_id, card_id, pos))
+        if action is None:
+            action = _build_actions[wonder_id, card_id, pos] = BuildWonderAction(wonder_id, card_id, pos)
+        return action
+
+    @staticmethod
+    def update_cards(cache: MovesCache, available_cards: List[Tuple[int, Tuple[int, int]]]):
+        if cache.available_cards is available_cards:
+            return
+        cache.available_cards = available_cards
+        cache.discard_actions = [MoveGenerator.discard_action(card_id, pos) for card_id, pos in available_cards]
+        cache.buy_actions = [MoveGenerator.buy_action(card_id, pos) for card_id, pos in available_cards]
+        cache.build_actions = {}
+        cache.actions = [None, None]
+
+    @staticmethod
+    def build_actions(cache: MovesCache, wonder_id: int) -> List[BuildWonderAction]:
+        actions = cache.build_actions.get(wonder_id)
+        if actions is None:
+            actions = cache.build_actions[wonder_id] = [MoveGenerator.build_action(wonder_id, card_id, pos)
+                                                        for card_id, pos in cache.available_cards]
+        return actions
@@ -0,0 +1,137 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .action_space import CARDS_COUNT, WONDERS_COUNT, TOKEN_NAMES, TOKEN_INDICES
+from .bonuses import BONUSES
+from .cards_board import CardsBoard, CLOSED_CARD, CLOSED_PURPLE_CARD
+from .game import Game, OFFERED_PROGRESS_TOKENS
+from .states.game_state import GameState, GameStatus
+from .states.military_state_track import MILITARY_TOKENS_COUNT
+
+
+"""
+Observation is a float32 vector from the point of view of the current player,
+"player" features come first and "opponent" features second.
+
+Layout:
+AGE - age one-hot (3)
+CURRENT_PLAYER - current player index one-hot (2)
+GAME_STATUS - game status one-hot (len(GameStatus))
+IS_DOUBLE_TURN - 1 if the current player plays again (1)
+CONFLICT_PAWN - conflict pawn position, positive towards the opponent's capital (1)
+MILITARY_TOKENS - military tokens still on the track, opponent's tokens first, closest to the center first (4)
+PROGRESS_TOKENS - progress tokens on the board (tokens count)
+REST_PROGRESS_TOKENS - progress tokens offered by The Great Library, only during PICK_REST_PROGRESS_TOKEN (tokens count)
+WONDERS - wonders available for picking (wonders count)
+DISCARD_PILE - discarded cards (cards count)
+ACCESSIBLE_CARDS - cards that can be taken from the board (cards count)
+BLOCKED_CARDS - face-up cards on the board covered by other cards (cards count)
+CLOSED_CARDS - board slots with a face-down card, row-major (7 * 6)
+CLOSED_PURPLE_CARDS - board slots with a face-down guild card, row-major (7 * 6)
+then PLAYER_SIZE features for the player and then for the opponent, offsets are relative to the player block:
+PLAYER_COINS - coins (1)
+PLAYER_BONUSES - bonuses, indexed as BONUSES (len(BONUSES))
+PLAYER_CARDS - owned cards (cards count)
+PLAYER_UNBUILT_WONDERS - picked wonders that are not built yet (wonders count)
+PLAYER_BUILT_WONDERS - built wonders (wonders count)
+PLAYER_PROGRESS_TOKENS - owned progress tokens (tokens count)
+Hidden information (the remaining decks, the face-down cards and the unrevealed progress tokens) isn't encoded.
+"""
+
+BOARD_SLOTS = 7 * 6
+STATUS_INDICES = {status: i for i, status in enumerate(GameStatus)}
+MILITARY_TOKENS_ORDER = [(2, 3, 1, 0), (1, 0, 2, 3)]
+
+AGE = 0
+CURRENT_PLAYER = AGE + 3
+GAME_STATUS = CURRENT_PLAYER + 2
+IS_DOUBLE_TURN = GAME_STATUS + len(GameStatus)
+CONFLICT_PAWN = IS_DOUBLE_TURN + 1
+MILITARY_TOKENS = CONFLICT_PAWN + 1
+PROGRESS_TOKENS = MILITARY_TOKENS + MILITARY_TOKENS_COUNT
+REST_PROGRESS_TOKENS = PROGRESS_TOKENS + len(TOKEN_NAMES)
+WONDERS = REST_PROGRESS_TOKENS + len(TOKEN_NAMES)
+DISCARD_PILE = WONDERS + WONDERS_COUNT
+ACCESSIBLE_CARDS = DISCARD_PILE + CARDS_COUNT
+BLOCKED_CARDS = ACCESSIBLE_CARDS + CARDS_COUNT
+CLOSED_CARDS = BLOCKED_CARDS + CARDS_COUNT
+CLOSED_PURPLE_CARDS = CLOSED_CARDS + BOARD_SLOTS
+PLAYERS = CLOSED_PURPLE_CARDS + BOARD_SLOTS
+
+PLAYER_COINS = 0
+PLAYER_BONUSES = PLAYER_COINS + 1
+PLAYER_CARDS = PLAYER_BONUSES + len(BONUSES)
+PLAYER_UNBUILT_WONDERS = PLAYER_CARDS + CARDS_COUNT
+PLAYER_BUILT_WONDERS = PLAYER_UNBUILT_WONDERS + WONDERS_COUNT
+PLAYER_PROGRESS_TOKENS = PLAYER_BUILT_WONDERS + WONDERS_COUNT
+PLAYER_SIZE = PLAYER_PROGRESS_TOKENS + len(TOKEN_NAMES)
+
+OBSERVATION_SIZE = PLAYERS + 2 * PLAYER_SIZE
+
+
+class Observation:
+    @staticmethod
+    def encode(state: GameState, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        else:
+            out[:] = 0
+
+        player_index = state.current_player_index
+        military_track_state = state.military_track_state
+        out[IS_DOUBLE_TURN] = state.is_double_turn
+        out[CONFLICT_PAWN] = military_track_state.conflict_pawn if player_index == 0 \
+            else -military_track_state.conflict_pawn
+
+        ones = [AGE + state.age, CURRENT_PLAYER + player_index, GAME_STATUS + STATUS_INDICES[state.game_status]]
+        military_tokens = military_track_state.military_tokens
+        ones.extend(MILITARY_TOKENS + i for i, token_index in enumerate(MILITARY_TOKENS_ORDER[player_index])
+                    if military_tokens >> token_index & 1)
+        ones.extend(PROGRESS_TOKENS + TOKEN_INDICES[name] for name in state.progress_tokens)
+        if state.game_status == GameStatus.PICK_REST_PROGRESS_TOKEN:
+            ones.extend(REST_PROGRESS_TOKENS + TOKEN_INDICES[name]
+                        for name in state.rest_progress_tokens[:OFFERED_PROGRESS_TOKENS])
+        if state.game_status == GameStatus.PICK_WONDER:
+            ones.extend(WONDERS + wonder_id for wonder_id in Game.offered_wonders(state))
+        ones.extend(DISCARD_PILE + card_id for card_id in state.discard_pile)
+
+        cards_board_state = state.cards_board_state
+        if len(cards_board_state.card_places) > 0:
+            accessible_cards = {card_id for card_id, _ in CardsBoard.available_cards(cards_board_state)}
+            ones.extend(ACCESSIBLE_CARDS + card_id for card_id in accessible_cards)
+            slot = 0
+            for row in cards_board_state.card_places:
+                for card_id in row:
+                    if card_id >= 0:
+                        if card_id not in accessible_cards:
+                            ones.append(BLOCKED_CARDS + card_id)
+                    elif card_id == CLOSED_CARD:
+                        ones.append(CLOSED_CARDS + slot)
+                    elif card_id == CLOSED_PURPLE_CARD:
+                        ones.append(CLOSED_PURPLE_CARDS + slot)
+                    slot += 1
+
+        for i in range(2):
+            player_state = state.players_state[player_index if i == 0 else 1 - player_index]
+            offset = PLAYERS + i * PLAYER_SIZE
+            out[offset + PLAYER_COINS] = player_state.coins
+            out[offset + PLAYER_BONUSES:offset + PLAYER_BONUSES + len(BONUSES)] = player_state.bonuses
+            ones.extend(offset + PLAYER_CARDS + card_id for card_id in player_state.cards)
+            for wonder_id, card_id in player_state.wonders:
+                if card_id is None:
+                    ones.append(offset + PLAYER_UNBUILT_WONDERS + wonder_id)
+                else:
+                    ones.append(offset + PLAYER_BUILT_WONDERS + wonder_id)
+            ones.extend(offset + PLAYER_PROGRESS_TOKENS + TOKEN_INDICES[name] for name in player_state.progress_tokens)
+
+        out[ones] = 1
+        return out
+
+    @staticmethod
+    def encode_batch(states: Sequence[GameState], out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = np.zeros((len(states), OBSERVATION_SIZE), dtype=np.float32)
+        for i, state in enumerate(states):
+            Observation.encode(state, out[i])
+        return out
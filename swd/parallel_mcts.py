@@ -0,0 +1,130 @@
+import multiprocessing
+import random
+import time
+from enum import Enum, auto
+from typing import Dict, Optional, Sequence, Tuple
+
+from .action import Action
+from .action_space import ActionSpace
+from .agents import Agent
+from .game import Game
+from .mcts import MCTSAgent, Node, RolloutPolicy, random_rollout
+from .states.game_state import GameState
+
+
+class ParallelMode(Enum):
+    ROOT = auto()
+    TREE = auto()
+
+
+def _root_search(task: Tuple[GameState, int, Optional[int], Optional[float], float, RolloutPolicy]) -> Dict[int, int]:
+    state, seed, iterations, time_limit, exploration, rollout_policy = task
+    random.seed(seed)
+    agent = MCTSAgent(iterations, time_limit, exploration, rollout_policy, reuse_tree=False)
+    agent.root = Node(1 - state.current_player_index)
+    agent.search(state)
+    return {action_id: child.visits for action_id, child in agent.root.children.items()}
+
+
+def _rollout(task: Tuple[GameState, int, RolloutPolicy]) -> int:
+    state, seed, rollout_policy = task
+    random.seed(seed)
+    agent = MCTSAgent(1, None, rollout_policy=rollout_policy, reuse_tree=False)
+    return agent.rollout(state)
+
+
+class ParallelMCTSAgent(Agent):
+    """
+    MCTS over a process pool.
+    ROOT mode runs an independent determinized search in every worker and sums root visit counts,
+    `iterations` are split between workers and every worker searches for `time_limit`.
+    TREE mode keeps one tree in this process, selects `batch_size` leaves at a time with virtual loss
+    so that they differ, and runs their rollouts in the pool.
+    The pool is created on the first move, call `close` or use the agent as a context manager to stop it.
+    """
+    processes: int
+    mode: ParallelMode
+
+    def __init__(self,
+                 processes: Optional[int] = None,
+                 iterations: Optional[int] = 1000,
+                 time_limit: Optional[float] = None,
+                 exploration: float = 0.7,
+                 rollout_policy: RolloutPolicy = random_rollout,
+                 mode: ParallelMode = ParallelMode.ROOT,
+                 batch_size: Optional[int] = None,
+                 virtual_loss: int = 1):
+        super().__init__()
+        if iterations is None and time_limit is None:
+            raise ValueError
+        if mode == ParallelMode.TREE and virtual_loss < 1:
+            raise ValueError
+        self.processes = processes or multiprocessing.cpu_count()
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rollout_policy = rollout_policy
+        self.mode = mode
+        self.batch_size = batch_size or self.processes
+        self.virtual_loss = virtual_loss
+        self.agent = MCTSAgent(iterations, time_limit, exploration, rollout_policy, reuse_tree=False)
+        self.pool = None
+
+    def __enter__(self) -> 'ParallelMCTSAgent':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def choose_action(self, state: GameState, possible_actions: Sequence[Action]) -> Action:
+        if len(possible_actions) == 1:
+            return possible_actions[0]
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.processes)
+
+        if self.mode == ParallelMode.ROOT:
+            visits = self.root_search(state)
+        else:
+            visits = self.tree_search(state)
+
+        return max(possible_actions, key=lambda x: visits.get(ActionSpace.encode(x), 0))
+
+    def root_search(self, state: GameState) -> Dict[int, int]:
+        iterations = None
+        if self.iterations is not None:
+            iterations = max(self.iterations // self.processes, 1)
+        tasks = [(state, random.getrandbits(32), iterations, self.time_limit, self.exploration, self.rollout_policy)
+                 for _ in range(self.processes)]
+        visits: Dict[int, int] = {}
+        for result in self.pool.imap_unordered(_root_search, tasks):
+            for action_id, count in result.items():
+                visits[action_id] = visits.get(action_id, 0) + count
+        return visits
+
+    def tree_search(self, state: GameState) -> Dict[int, int]:
+        agent = self.agent
+        agent.root = Node(1 - state.current_player_index)
+        start = time.perf_counter()
+        iteration = 0
+        while iteration == 0 or \
+                (self.iterations is None or iteration < self.iterations) and \
+                (self.time_limit is None or time.perf_counter() - start < self.time_limit):
+            batch_size = self.batch_size
+            if self.iterations is not None:
+                batch_size = min(batch_size, self.iterations - iteration)
+            paths = []
+            tasks = []
+            for _ in range(batch_size):
+                leaf_state = Game.determinize(state)
+                paths.append(agent.select(leaf_state, self.virtual_loss))
+                tasks.append((leaf_state, random.getrandbits(32), self.rollout_policy))
+            for path, winner in zip(paths, self.pool.map(_rollout, tasks)):
+                MCTSAgent.backpropagate(path, winner, self.virtual_loss)
+            iteration += batch_size
+        return {action_id: child.visits for action_id, child in agent.root.children.items()}
@@ -1,23 +1,28 @@
-from typing import Optional, List
+from typing import Iterable, List, Optional, Tuple
 
 from .assets import Assets
 from .cards import Card
 from .entity_manager import EntityManager
+from .price_engine import PriceEngine
 from .progress_tokens import ProgressToken
-from .bonuses import BONUSES, RESOURCE_RANGE, GENERAL_RESOURCES_RANGE, TRADE_RESOURCES_RANGE, SCIENTIFIC_SYMBOLS_RANGE,\
+from .score import CARD_POINTS, BLUE_CARD_POINTS, WONDER_POINTS, TOKEN_POINTS, BUILT_WONDERS, \
+    DISTINCT_SCIENTIFIC_SYMBOLS
+from .bonuses import RESOURCE_RANGE, GENERAL_RESOURCES_RANGE, TRADE_RESOURCES_RANGE, SCIENTIFIC_SYMBOLS_RANGE, \
     CHAIN_SYMBOLS_RANGE
+from .bonus_indices import BLUE, MASONRY, ARCHITECTURE, URBANISM
 from .states.player_state import PlayerState
 from .wonders import Wonder
 
 
+SCIENTIFIC_SYMBOL_INDICES = range(SCIENTIFIC_SYMBOLS_RANGE.start, SCIENTIFIC_SYMBOLS_RANGE.stop)
+
+
 class Player:
     @staticmethod
     def wonders(state: PlayerState) -> List[Wonder]:
         result = []
         for wonder_id, card_id in state.wonders:
-            wonder = EntityManager.wonder(wonder_id)
-            wonder.card_id = card_id
-            result.append(wonder)
+            result.append(EntityManager.wonder(wonder_id).with_card(card_id))
         return result
 
     @staticmethod
@@ -32,12 +37,12 @@ class Player:
     def assets(state: PlayerState, opponents_resources: List[int], card: Optional[Card]) -> Assets:
         resources = list(Player.resources(state)) + list(Player.general_resources(state)) + [0]
         if card is not None:
-            if BONUSES.index("blue") in card.bonuses:
-                resources[7] = 2 if state.bonuses[BONUSES.index("masonry")] > 0 else 0
+            if card.color == BLUE:
+                resources[7] = 2 if state.bonuses[MASONRY] > 0 else 0
         else:
-            resources[7] = 2 if state.bonuses[BONUSES.index("architecture")] > 0 else 0
+            resources[7] = 2 if state.bonuses[ARCHITECTURE] > 0 else 0
         opponents_resources = [1 if t else r + 2 for r, t in zip(opponents_resources, Player.trade_resources(state))]
-        urbanism = state.bonuses[BONUSES.index("urbanism")] > 0
+        urbanism = state.bonuses[URBANISM] > 0
         return Assets(state.coins, resources, opponents_resources, list(Player.chain_symbols(state)), urbanism)
 
     @staticmethod
@@ -61,16 +66,38 @@ class Player:
         return state.bonuses[CHAIN_SYMBOLS_RANGE]
 
     @staticmethod
-    def add_card(state: PlayerState, card: Card):
-        state.cards.append(card.id)
-        for bonus, value in card.bonuses.items():
+    def add_bonuses(state: PlayerState, bonus_items: Iterable[Tuple[int, int]]):
+        for bonus, value in bonus_items:
             state.bonuses[bonus] += value
+            if bonus in SCIENTIFIC_SYMBOL_INDICES and state.bonuses[bonus] == value:
+                state.score[DISTINCT_SCIENTIFIC_SYMBOLS] += 1
+
+    @staticmethod
+    def remove_bonuses(state: PlayerState, bonus_items: Iterable[Tuple[int, int]]):
+        for bonus, value in bonus_items:
+            state.bonuses[bonus] -= value
+            if bonus in SCIENTIFIC_SYMBOL_INDICES and state.bonuses[bonus] == 0:
+                state.score[DISTINCT_SCIENTIFIC_SYMBOLS] -= 1
+
+    @staticmethod
+    def add_card(state: PlayerState, card: Card, index: Optional[int] = None):
+        if index is None:
+            state.cards.append(card.id)
+        else:
+            state.cards.insert(index, card.id)
+        Player.add_bonuses(state, card.bonus_items)
+        state.score[CARD_POINTS] += card.points
+        if card.color == BLUE:
+            state.score[BLUE_CARD_POINTS] += card.points
 
     @staticmethod
     def destroy_card(state: PlayerState, card_id: int):
         state.cards.remove(card_id)
-        for bonus, value in EntityManager.card(card_id).bonuses.items():
-            state.bonuses[bonus] -= value
+        card = EntityManager.card(card_id)
+        Player.remove_bonuses(state, card.bonus_items)
+        state.score[CARD_POINTS] -= card.points
+        if card.color == BLUE:
+            state.score[BLUE_CARD_POINTS] -= card.points
 
     @staticmethod
     def add_wonder(state: PlayerState, wonder_id: int):
@@ -83,16 +110,38 @@ class Player:
                 if wonder[1] is not None:
                     raise ValueError
                 state.wonders[i] = wonder_id, card_id
-                for bonus, value in EntityManager.wonder(wonder_id).bonuses.items():
-                    state.bonuses[bonus] += value
+                wonder = EntityManager.wonder(wonder_id)
+                Player.add_bonuses(state, wonder.bonus_items)
+                state.score[WONDER_POINTS] += wonder.points
+                state.score[BUILT_WONDERS] += 1
+                return
+        raise ValueError
+
+    @staticmethod
+    def unbuild_wonder(state: PlayerState, wonder_id: int):
+        for i, wonder in enumerate(state.wonders):
+            if wonder[0] == wonder_id:
+                if wonder[1] is None:
+                    raise ValueError
+                state.wonders[i] = wonder_id, None
+                wonder = EntityManager.wonder(wonder_id)
+                Player.remove_bonuses(state, wonder.bonus_items)
+                state.score[WONDER_POINTS] -= wonder.points
+                state.score[BUILT_WONDERS] -= 1
                 return
         raise ValueError
 
     @staticmethod
     def add_progress_token(state: PlayerState, progress_token: ProgressToken):
         state.progress_tokens.append(progress_token.name)
-        for bonus, value in progress_token.bonuses.items():
-            state.bonuses[bonus] += value
+        Player.add_bonuses(state, progress_token.bonus_items)
+        state.score[TOKEN_POINTS] += progress_token.points
+
+    @staticmethod
+    def remove_progress_token(state: PlayerState, progress_token: ProgressToken):
+        state.progress_tokens.remove(progress_token.name)
+        Player.remove_bonuses(state, progress_token.bonus_items)
+        state.score[TOKEN_POINTS] -= progress_token.points
 
     @staticmethod
     def remove_unbuilt_wonders(state: PlayerState):
@@ -100,8 +149,8 @@ class Player:
 
     @staticmethod
     def card_price(state: PlayerState, card: Card, opponent_state: PlayerState) -> int:
-        return Player.assets(state, Player.resources(opponent_state), card).coins_for_price(card.price)
+        return PriceEngine.card_price(state, card.id, opponent_state)
 
     @staticmethod
     def wonder_price(state: PlayerState, wonder: Wonder, opponent_state: PlayerState) -> int:
-        return Player.assets(state, Player.resources(opponent_state), None).coins_for_price(wonder.price)
+        return PriceEngine.wonder_price(state, wonder.id, opponent_state)
@@ -0,0 +1,119 @@
+from typing import Dict, FrozenSet, List, Tuple
+
+from .assets import Assets
+from .bonuses import BONUSES, RESOURCES, RESOURCE_RANGE, TRADE_RESOURCES_RANGE, CHAIN_SYMBOLS_RANGE
+from .bonus_indices import BLUE, MATERIALS, GOODS, MASONRY, ARCHITECTURE, URBANISM, WOOD, STONE, GLASS, PAPER
+from .entity_manager import EntityManager
+from .price import Price
+from .states.player_state import PlayerState
+
+
+"""
+Prices are stored as (coins, resources, chain symbol bonus index or -1, is masonry discounted).
+The cost of missing resources depends only on the resources still needed after own production,
+the trade cost of each of them and the wildcards, so it's memoized by that key for all cards, wonders and games.
+"""
+
+EntityPrice = Tuple[int, Tuple[int, ...], int, bool]
+
+RESOURCE_INDICES = list(range(RESOURCE_RANGE.start, RESOURCE_RANGE.stop))
+TRADE_INDICES = list(range(TRADE_RESOURCES_RANGE.start, TRADE_RESOURCES_RANGE.stop))
+
+
+def _entity_price(price: Price, is_blue: bool) -> EntityPrice:
+    chain_symbol = CHAIN_SYMBOLS_RANGE.start + price.chain_symbol if price.chain_symbol >= 0 else -1
+    return price.coins, tuple(price.resources), chain_symbol, is_blue
+
+
+CARD_PRICES: List[EntityPrice] = [_entity_price(EntityManager.card(i).price, EntityManager.card(i).color == BLUE)
+                                  for i in range(EntityManager.cards_count())]
+WONDER_PRICES: List[EntityPrice] = [_entity_price(EntityManager.wonder(i).price, False)
+                                    for i in range(EntityManager.wonders_count())]
+
+"""
+Price cache keys are card ids for cards and cards count + wonder id for wonders.
+PRICE_DEPENDENTS[bonus] are the keys whose price can change when the player's `bonus` changes,
+OPPONENT_PRICE_DEPENDENTS[bonus] are the keys whose price can change when the opponent's `bonus` changes.
+"""
+
+PRICE_KEYS: List[Tuple[int, EntityPrice]] = list(enumerate(CARD_PRICES + WONDER_PRICES))
+
+
+def _dependents(predicate) -> FrozenSet[int]:
+    return frozenset(key for key, price in PRICE_KEYS if predicate(key, price))
+
+
+def _needs(first: int, last: int):
+    return lambda key, price: any(price[1][i] > 0 for i in range(first, last + 1))
+
+
+PRICE_DEPENDENTS: List[FrozenSet[int]] = [frozenset()] * len(BONUSES)
+OPPONENT_PRICE_DEPENDENTS: List[FrozenSet[int]] = [frozenset()] * len(BONUSES)
+for _i in range(len(RESOURCES)):
+    PRICE_DEPENDENTS[RESOURCE_INDICES[_i]] = _dependents(_needs(_i, _i))
+    PRICE_DEPENDENTS[TRADE_INDICES[_i]] = PRICE_DEPENDENTS[RESOURCE_INDICES[_i]]
+    OPPONENT_PRICE_DEPENDENTS[RESOURCE_INDICES[_i]] = PRICE_DEPENDENTS[RESOURCE_INDICES[_i]]
+for _i in range(CHAIN_SYMBOLS_RANGE.start, CHAIN_SYMBOLS_RANGE.stop):
+    PRICE_DEPENDENTS[_i] = _dependents(lambda key, price: price[2] == _i)
+PRICE_DEPENDENTS[MATERIALS] = _dependents(_needs(WOOD, STONE))
+PRICE_DEPENDENTS[GOODS] = _dependents(_needs(GLASS, PAPER))
+PRICE_DEPENDENTS[MASONRY] = _dependents(lambda key, price: price[3] and any(price[1]))
+PRICE_DEPENDENTS[ARCHITECTURE] = _dependents(lambda key, price: key >= len(CARD_PRICES) and any(price[1]))
+PRICE_DEPENDENTS[URBANISM] = _dependents(lambda key, price: price[2] >= 0)
+
+
+class PriceEngine:
+    costs: Dict[Tuple[int, ...], int] = {}
+
+    @staticmethod
+    def card_price(state: PlayerState, card_id: int, opponent_state: PlayerState) -> int:
+        price = CARD_PRICES[card_id]
+        return PriceEngine.price(state, price, opponent_state, 2 if price[3] and state.bonuses[MASONRY] > 0 else 0)
+
+    @staticmethod
+    def wonder_price(state: PlayerState, wonder_id: int, opponent_state: PlayerState) -> int:
+        return PriceEngine.price(state, WONDER_PRICES[wonder_id], opponent_state,
+                                 2 if state.bonuses[ARCHITECTURE] > 0 else 0)
+
+    @staticmethod
+    def price(state: PlayerState, price: EntityPrice, opponent_state: PlayerState, discount: int) -> int:
+        coins, resources, chain_symbol, _ = price
+        bonuses = state.bonuses
+        if chain_symbol >= 0 and bonuses[chain_symbol]:
+            return -4 if bonuses[URBANISM] else 0
+
+        needed = []
+        has_needed = False
+        for amount, index in zip(resources, RESOURCE_INDICES):
+            amount -= bonuses[index]
+            if amount > 0:
+                needed.append(amount)
+                has_needed = True
+            else:
+                needed.append(0)
+        if not has_needed:
+            return coins
+
+        opponent_bonuses = opponent_state.bonuses
+        for i in range(len(RESOURCES)):
+            if needed[i] > 0:
+                needed.append(1 if bonuses[TRADE_INDICES[i]] else opponent_bonuses[RESOURCE_INDICES[i]] + 2)
+            else:
+                needed.append(0)
+        needed.append(bonuses[MATERIALS])
+        needed.append(bonuses[GOODS])
+        needed.append(discount)
+        key = tuple(needed)
+
+        cost = PriceEngine.costs.get(key)
+        if cost is None:
+            cost = PriceEngine.costs[key] = PriceEngine.cost(key)
+        return coins + cost
+
+    @staticmethod
+    def cost(key: Tuple[int, ...]) -> int:
+        count = len(RESOURCES)
+        price = Price()
+        price.resources = list(key[:count])
+        assets = Assets(0, [0] * count + list(key[2 * count:]), list(key[count:2 * count]), [], False)
+        return assets.coins_for_price(price)
@@ -1,24 +1,46 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple
 
+from .entity_fields import bonus_vector, instant_bonus_items, invalidates_prices
 from .bonuses import BONUSES, INSTANT_BONUSES
+from .bonus_indices import POINTS, PROGRESS_TOKEN
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProgressToken:
+    """
+    Immutable, shared between games. Fields after `instant_bonuses` are derived from the ones before.
+    """
+    __slots__ = ("name", "bonuses", "instant_bonuses", "points", "bonus_vector", "bonus_items", "instant_bonus_items",
+                 "invalidates_prices")
     name: str
-    bonuses: Dict[int, int] = field(default_factory=dict)
-    instant_bonuses: List[int] = field(default_factory=list)
+    bonuses: Dict[int, int]
+    instant_bonuses: Tuple[int, ...]
+    points: int
+    bonus_vector: Tuple[int, ...]
+    bonus_items: Tuple[Tuple[int, int], ...]
+    instant_bonus_items: Tuple[Tuple[int, int], ...]
+    invalidates_prices: bool
 
-    @property
-    def points(self) -> int:
-        return self.bonuses.get(BONUSES.index("points"), 0)
+    def __reduce__(self):
+        return ProgressToken, tuple(getattr(self, x) for x in self.__slots__)
+
+    @staticmethod
+    def create(name: str, bonuses: Dict[int, int], instant_bonuses: Tuple[int, ...]):
+        return ProgressToken(name,
+                             bonuses,
+                             instant_bonuses,
+                             bonuses.get(POINTS, 0),
+                             bonus_vector(bonuses),
+                             tuple(bonuses.items()),
+                             instant_bonus_items(instant_bonuses),
+                             invalidates_prices(bonuses))
 
     @staticmethod
     def from_dict(description: Dict[str, Any]):
         if description["effect"] is None:
             description["effect"] = {}
-        bonuses = {BONUSES.index("progress_token"): 1}
+        bonuses = {PROGRESS_TOKEN: 1}
         instant_bonuses = [0] * len(INSTANT_BONUSES)
         for effect_name, effect in description["effect"].items():
             if effect_name in BONUSES:
@@ -27,6 +49,6 @@ class ProgressToken:
                 instant_bonuses[INSTANT_BONUSES.index(effect_name)] = effect
             elif effect in BONUSES:
                 bonuses[BONUSES.index(effect)] = 1
-        return ProgressToken(description["name"],
-                             bonuses,
-                             instant_bonuses)
+        return ProgressToken.create(description["name"],
+                                    bonuses,
+                                    tuple(instant_bonuses))
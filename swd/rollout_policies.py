@@ -0,0 +1,150 @@
+import math
+import random
+from typing import List, Optional, Tuple, Union
+
+from .action import Action
+from .bonuses import RESOURCE_RANGE, GENERAL_RESOURCES_RANGE
+from .bonus_indices import STRATEGY
+from .cards import Card
+from .cards_board import CardsBoard
+from .entity_manager import EntityManager
+from .game import Game
+from .move_generator import MoveGenerator
+from .player import SCIENTIFIC_SYMBOL_INDICES
+from .score import DISTINCT_SCIENTIFIC_SYMBOLS
+from .states.game_state import GameState, GameStatus
+from .states.player_state import PlayerState
+from .wonders import Wonder
+
+
+"""
+Rollout policies sample a normal turn move without building the list of all available actions:
+they look at the cards on the board and price only what they are about to play.
+Other decisions have few options and are drawn uniformly from `Game.get_available_actions`.
+"""
+
+SUPREMACY_PAWN = 9
+SCIENTIFIC_SUPREMACY_SYMBOLS = 6
+RESOURCE_INDICES = list(range(RESOURCE_RANGE.start, GENERAL_RESOURCES_RANGE.stop))
+
+
+def fast_random_rollout(state: GameState) -> Action:
+    """
+    Draws a card and then the kind of move, buying and building fall back to discarding if they are unaffordable.
+    """
+    if state.game_status != GameStatus.NORMAL_TURN:
+        return random.choice(Game.get_available_actions(state))
+
+    card_id, pos = random.choice(CardsBoard.available_cards(state.cards_board_state))
+    player_index = state.current_player_index
+    player_state = state.players_state[player_index]
+    kind = random.randrange(3)
+    if kind == 0:
+        if Game.card_price(state, EntityManager.card(card_id), player_index) <= player_state.coins:
+            return MoveGenerator.buy_action(card_id, pos)
+    elif kind == 1:
+        wonder_ids = [wonder_id for wonder_id, wonder_card_id in player_state.wonders if wonder_card_id is None]
+        if len(wonder_ids) > 0:
+            wonder_id = random.choice(wonder_ids)
+            if Game.wonder_price(state, EntityManager.wonder(wonder_id), player_index) <= player_state.coins:
+                return MoveGenerator.build_action(wonder_id, card_id, pos)
+    return MoveGenerator.discard_action(card_id, pos)
+
+
+class HeuristicRollout:
+    """
+    Greedy rollout policy that plays the best value per coin.
+    A card or a wonder is worth its points, one point per other instant effect, its shields weighted by `military`,
+    a new scientific symbol weighted by `science` and, before the last age, its resources weighted by `resources`.
+    Shields count more the closer the conflict pawn is to a capital, symbols the more distinct symbols there are.
+    Moves that win at once are always played. A wonder is built with the least valuable card,
+    if nothing is worth buying the least valuable card is discarded.
+    With probability `epsilon` the move is drawn by `fast_random_rollout` instead.
+    """
+    military: float
+    science: float
+    resources: float
+    epsilon: float
+
+    def __init__(self, military: float = 1.0, science: float = 1.0, resources: float = 0.5, epsilon: float = 0.1):
+        self.military = military
+        self.science = science
+        self.resources = resources
+        self.epsilon = epsilon
+
+    def __call__(self, state: GameState) -> Action:
+        if state.game_status != GameStatus.NORMAL_TURN or random.random() < self.epsilon:
+            return fast_random_rollout(state)
+
+        player_index = state.current_player_index
+        player_state = state.players_state[player_index]
+        pawn = state.military_track_state.conflict_pawn * (1 if player_index == 0 else -1)
+        coins = player_state.coins
+
+        cards: List[Tuple[float, int, Tuple[int, int]]] = []
+        best: Optional[Action] = None
+        best_score = -math.inf
+        for card_id, pos in CardsBoard.available_cards(state.cards_board_state):
+            card = EntityManager.card(card_id)
+            value = self.card_value(state, player_state, pawn, card)
+            cards.append((value, card_id, pos))
+            price = Game.card_price(state, card, player_index)
+            if price > coins:
+                continue
+            score = value / (max(price, 0) + 1)
+            if score > best_score:
+                best, best_score = MoveGenerator.buy_action(card_id, pos), score
+
+        _, card_id, pos = min(cards)
+        for wonder_id, wonder_card_id in player_state.wonders:
+            if wonder_card_id is not None:
+                continue
+            wonder = EntityManager.wonder(wonder_id)
+            price = Game.wonder_price(state, wonder, player_index)
+            if price > coins:
+                continue
+            score = self.wonder_value(pawn, wonder) / (price + 1)
+            if score > best_score:
+                best, best_score = MoveGenerator.build_action(wonder_id, card_id, pos), score
+
+        if best is None or best_score <= 0:
+            return MoveGenerator.discard_action(card_id, pos)
+        return best
+
+    def card_value(self, state: GameState, player_state: PlayerState, pawn: int, card: Card) -> float:
+        shields = card.shields
+        if shields > 0 and player_state.bonuses[STRATEGY] > 0:
+            shields += 1
+        value = card.points + HeuristicRollout.effects_value(card) + self.shields_value(pawn, shields) + \
+            3 * len(card.points_bonuses)
+        for bonus, amount in card.bonus_items:
+            if bonus in SCIENTIFIC_SYMBOL_INDICES:
+                distinct = player_state.score[DISTINCT_SCIENTIFIC_SYMBOLS]
+                if player_state.bonuses[bonus] == 0:
+                    if distinct + 1 >= SCIENTIFIC_SUPREMACY_SYMBOLS:
+                        return math.inf
+                    value += self.science * (1 + distinct / 2)
+                elif player_state.bonuses[bonus] == 1:
+                    value += self.science * 2
+        if state.age < 2:
+            value += self.resources * sum(card.bonus_vector[i] for i in RESOURCE_INDICES)
+        return value
+
+    def wonder_value(self, pawn: int, wonder: Wonder) -> float:
+        return wonder.points + HeuristicRollout.effects_value(wonder) + self.shields_value(pawn, wonder.shields)
+
+    @staticmethod
+    def effects_value(entity: Union[Card, Wonder]) -> int:
+        return len(entity.instant_bonus_items) - (1 if entity.shields > 0 else 0)
+
+    def shields_value(self, pawn: int, shields: int) -> float:
+        if shields == 0:
+            return 0
+        if pawn + shields >= SUPREMACY_PAWN:
+            return math.inf
+        return self.military * shields * (1 + abs(pawn) / 3)
+
+
+greedy_rollout = HeuristicRollout()
+military_rollout = HeuristicRollout(military=3.0, science=0.5)
+science_rollout = HeuristicRollout(military=0.5, science=3.0)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+"""
+Running score and counters of a player kept in `PlayerState.score`,
+updated by `Player` with every card, wonder and token.
+Coins, military and guild points depend on both players, they are derived from the state in O(1) instead.
+"""
+
+CARD_POINTS = 0
+BLUE_CARD_POINTS = 1
+WONDER_POINTS = 2
+TOKEN_POINTS = 3
+BUILT_WONDERS = 4
+DISTINCT_SCIENTIFIC_SYMBOLS = 5
+SCORE_SIZE = 6
+
+
+@dataclass
+class Score:
+    cards: int
+    wonders: int
+    tokens: int
+    coins: int
+    military: int
+    guilds: int
+    blue_cards: int
+
+    @property
+    def total(self) -> int:
+        return self.cards + self.wonders + self.tokens + self.coins + self.military + self.guilds
@@ -0,0 +1,206 @@
+import argparse
+import multiprocessing
+import random
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .agents import Agent, PolicyAgent, RandomAgent
+from .alpha_beta import AlphaBetaAgent
+from .game import Game
+from .game_record import GameRecord, GameRecordWriter
+from .mcts import MCTSAgent
+from .rollout_policies import greedy_rollout, military_rollout, science_rollout
+from .states.game_state import GameState, VictoryType
+
+
+AgentFactory = Callable[[], Agent]
+
+AGENTS: Dict[str, AgentFactory] = {
+    "random": RandomAgent,
+    "mcts": MCTSAgent,
+    "greedy": partial(PolicyAgent, greedy_rollout),
+    "military": partial(PolicyAgent, military_rollout),
+    "science": partial(PolicyAgent, science_rollout),
+    "alphabeta": partial(AlphaBetaAgent, time_limit=0.2),
+}
+
+
+@dataclass
+class GameResult:
+    seed: int
+    winner: int
+    victory_type: VictoryType
+    actions: int
+    points: Tuple[int, int]
+    record: Optional[GameRecord] = None
+
+
+@dataclass
+class SimulationStats:
+    games: int = 0
+    draws: int = 0
+    actions: int = 0
+    elapsed: float = 0
+    wins: List[int] = field(default_factory=lambda: [0, 0])
+    victories: Dict[VictoryType, List[int]] = field(default_factory=lambda: {x: [0, 0] for x in VictoryType})
+
+    def add(self, result: GameResult):
+        self.games += 1
+        self.actions += result.actions
+        if result.winner < 0:
+            self.draws += 1
+        else:
+            self.wins[result.winner] += 1
+            self.victories[result.victory_type][result.winner] += 1
+
+    def win_rate(self, agent_index: int, victory_type: Optional[VictoryType] = None) -> float:
+        if self.games == 0:
+            return 0
+        if victory_type is None:
+            return self.wins[agent_index] / self.games
+        return self.victories[victory_type][agent_index] / self.games
+
+    @property
+    def average_length(self) -> float:
+        return self.actions / self.games if self.games > 0 else 0
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0
+
+    def __str__(self) -> str:
+        result = f"games: {self.games}, draws: {self.draws}, " \
+                 f"average length: {self.average_length:.1f}, games/sec: {self.games_per_second:.1f}\n"
+        for agent_index in range(2):
+            result += f"agent {agent_index}: {self.win_rate(agent_index):.3f}"
+            for victory_type in VictoryType:
+                result += f", {victory_type.value} {self.win_rate(agent_index, victory_type):.3f}"
+            result += "\n"
+        return result
+
+
+def victory_type(state: GameState) -> VictoryType:
+    return Game.terminal_kind(state)
+
+
+def play_game(agents: Sequence[Agent], seed: int, record: bool = False) -> GameResult:
+    random.seed(seed)
+    state = Game.create(seed)
+    game_record = GameRecord.create(state, seed) if record else None
+    actions = 0
+    while not Game.is_finished(state):
+        possible_actions = Game.get_available_actions(state)
+        action = agents[state.current_player_index].choose_action(state, possible_actions)
+        if game_record is not None:
+            game_record.append(state, action)
+        Game.apply_action(state, action)
+        for agent in agents:
+            agent.on_action_applied(action, state)
+        actions += 1
+    if game_record is not None:
+        game_record.finish(state)
+    return GameResult(seed,
+                      state.winner,
+                      victory_type(state),
+                      actions,
+                      (Game.points(state, 0)[0], Game.points(state, 1)[0]),
+                      game_record)
+
+
+def _play_chunk(task: Tuple[Sequence[AgentFactory], bool, List[int], bool]) -> List[GameResult]:
+    agent_factories, alternate_seats, seeds, record = task
+    results = []
+    for seed in seeds:
+        agents = [factory() for factory in agent_factories]
+        swap = alternate_seats and seed % 2 == 1
+        result = play_game(agents[::-1] if swap else agents, seed, record)
+        if swap:
+            if result.winner >= 0:
+                result.winner = 1 - result.winner
+            result.points = result.points[::-1]
+        results.append(result)
+    return results
+
+
+def simulate_chunks(agent_factories: Sequence[AgentFactory],
+                    games: int,
+                    processes: Optional[int] = None,
+                    chunk_size: int = 16,
+                    seed: int = 0,
+                    alternate_seats: bool = True,
+                    record: bool = False) -> Iterator[List[GameResult]]:
+    """
+    Plays `games` games between two agents and yields results chunk by chunk as they are ready.
+    Game `i` is created and `random` is seeded with `seed + i`, so results don't depend on the pool size.
+    Winners and points are reported per agent, not per seat, game records are kept as played.
+    """
+    if len(agent_factories) != 2:
+        raise ValueError
+    tasks = [(agent_factories,
+              alternate_seats,
+              list(range(seed + start, seed + min(start + chunk_size, games))),
+              record)
+             for start in range(0, games, chunk_size)]
+    if processes == 1:
+        for task in tasks:
+            yield _play_chunk(task)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        for results in pool.imap_unordered(_play_chunk, tasks):
+            yield results
+
+
+def simulate(agent_factories: Sequence[AgentFactory],
+             games: int,
+             processes: Optional[int] = None,
+             chunk_size: int = 16,
+             seed: int = 0,
+             alternate_seats: bool = True,
+             writer: Optional[GameRecordWriter] = None) -> SimulationStats:
+    stats = SimulationStats()
+    start = time.perf_counter()
+    chunks = simulate_chunks(agent_factories, games, processes, chunk_size, seed, alternate_seats, writer is not None)
+    for results in chunks:
+        for result in results:
+            stats.add(result)
+            if writer is not None:
+                writer.write(result.record)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def main(args: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulate games between two agents")
+    parser.add_argument("agents", nargs=2, choices=sorted(AGENTS.keys()))
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("-p", "--processes", type=int, default=None, help="pool size, defaults to the number of CPUs")
+    parser.add_argument("-c", "--chunk-size", type=int, default=16)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("--fixed-seats", action="store_true", help="don't swap seats between games")
+    parser.add_argument("-r", "--record", help="append game records to this file and their offsets to RECORD.idx")
+    parsed = parser.parse_args(args)
+
+    agent_factories = [AGENTS[name] for name in parsed.agents]
+    if parsed.record is None:
+        stats = simulate(agent_factories,
+                         parsed.games,
+                         parsed.processes,
+                         parsed.chunk_size,
+                         parsed.seed,
+                         not parsed.fixed_seats)
+    else:
+        with open(parsed.record, "ab") as stream, open(parsed.record + ".idx", "ab") as index_stream:
+            stats = simulate(agent_factories,
+                             parsed.games,
+                             parsed.processes,
+                             parsed.chunk_size,
+                             parsed.seed,
+                             not parsed.fixed_seats,
+                             GameRecordWriter(stream, index_stream))
+    print(stats, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
-from copy import deepcopy
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 
 
 @dataclass
@@ -11,11 +10,15 @@ class CardsBoardState:
     purple_card_ids: List[int]
     preset: Optional[List[List[List[int]]]]
     available_cards: Optional[List[Tuple[int, Tuple[int, int]]]] = None
+    occupied: Optional[int] = None
+    card_slots: Optional[Dict[int, int]] = None
 
     def clone(self) -> 'CardsBoardState':
         return CardsBoardState(self.age,
-                               deepcopy(self.card_places),
+                               [row.copy() for row in self.card_places],
                                self.card_ids.copy(),
                                self.purple_card_ids.copy(),
-                               deepcopy(self.preset) if self.preset is not None else None,
-                               None)
+                               self.preset,
+                               None,
+                               self.occupied,
+                               self.card_slots.copy() if self.card_slots is not None else None)
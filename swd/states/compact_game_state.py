@@ -0,0 +1,587 @@
+from array import array
+from typing import List, Optional, Tuple, Any, Dict, Iterable
+
+from .cards_board_state import CardsBoardState
+from .game_state import GameState, GameStatus
+from .military_state_track import MilitaryTrackState
+from .player_state import PlayerState
+from .price_cache import PriceCache
+from ..bonuses import BONUSES
+from ..entity_manager import EntityManager
+from ..game_random import GameRandom
+from ..score import SCORE_SIZE
+
+
+"""
+All mutable game state lives in one int16 buffer, so `clone` is a single memcpy.
+Variable-length lists are stored as a length slot followed by a fixed number of item slots.
+
+Buffer layout:
+0 - age
+1 - current player index
+2 - is double turn
+3 - game status value
+4 - winner (NO_WINNER for None)
+5 - conflict pawn
+6 - military tokens bitmask
+7 - cards board age
+8 - cards board is generated
+then lists: progress tokens, rest progress tokens, discard pile, wonders,
+then two players: coins, cards, wonders (wonder id, card id or NO_CARD), progress tokens, bonuses, score,
+then the cards board: card places (7 x 6), card ids, purple card ids
+"""
+
+NO_WINNER = -2
+NO_CARD = -1
+
+CARDS_CAPACITY = 73
+WONDERS_CAPACITY = 8
+PLAYER_WONDERS_CAPACITY = 4
+TOKENS_CAPACITY = 10
+BOARD_ROWS = 7
+BOARD_COLUMNS = 6
+
+TOKEN_NAMES = EntityManager.progress_token_names()
+TOKEN_INDICES = {name: i for i, name in enumerate(TOKEN_NAMES)}
+STATUSES = {status.value: status for status in GameStatus}
+
+
+class _Layout:
+    def __init__(self):
+        self.size = 0
+
+    def allocate(self, size: int) -> int:
+        offset = self.size
+        self.size += size
+        return offset
+
+    def allocate_list(self, capacity: int, item_size: int = 1) -> int:
+        return self.allocate(1 + capacity * item_size)
+
+
+_layout = _Layout()
+AGE = _layout.allocate(1)
+CURRENT_PLAYER_INDEX = _layout.allocate(1)
+IS_DOUBLE_TURN = _layout.allocate(1)
+GAME_STATUS = _layout.allocate(1)
+WINNER = _layout.allocate(1)
+CONFLICT_PAWN = _layout.allocate(1)
+MILITARY_TOKENS = _layout.allocate(1)
+BOARD_AGE = _layout.allocate(1)
+BOARD_GENERATED = _layout.allocate(1)
+PROGRESS_TOKENS = _layout.allocate_list(TOKENS_CAPACITY)
+REST_PROGRESS_TOKENS = _layout.allocate_list(TOKENS_CAPACITY)
+DISCARD_PILE = _layout.allocate_list(CARDS_CAPACITY)
+WONDERS = _layout.allocate_list(WONDERS_CAPACITY)
+PLAYERS = _layout.size
+PLAYER_COINS = _layout.allocate(1) - PLAYERS
+PLAYER_CARDS = _layout.allocate_list(CARDS_CAPACITY) - PLAYERS
+PLAYER_WONDERS = _layout.allocate_list(PLAYER_WONDERS_CAPACITY, 2) - PLAYERS
+PLAYER_PROGRESS_TOKENS = _layout.allocate_list(TOKENS_CAPACITY) - PLAYERS
+PLAYER_BONUSES = _layout.allocate(len(BONUSES)) - PLAYERS
+PLAYER_SCORE = _layout.allocate(SCORE_SIZE) - PLAYERS
+PLAYER_SIZE = _layout.size - PLAYERS
+_layout.allocate(PLAYER_SIZE)
+CARD_PLACES = _layout.allocate(BOARD_ROWS * BOARD_COLUMNS)
+CARD_IDS = _layout.allocate_list(CARDS_CAPACITY)
+PURPLE_CARD_IDS = _layout.allocate_list(CARDS_CAPACITY)
+BUFFER_SIZE = _layout.size
+
+
+class BufferList:
+    __slots__ = ("buffer", "offset", "capacity")
+
+    def __init__(self, buffer: array, offset: int, capacity: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.capacity = capacity
+
+    def _encode(self, value: Any) -> int:
+        return value
+
+    def _decode(self, value: int) -> Any:
+        return value
+
+    def _index(self, index: int) -> int:
+        size = self.buffer[self.offset]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError
+        return self.offset + 1 + index
+
+    def __len__(self) -> int:
+        return self.buffer[self.offset]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.copy()[index]
+        return self._decode(self.buffer[self._index(index)])
+
+    def __setitem__(self, index, value: Any):
+        if isinstance(index, slice):
+            values = self.copy()
+            values[index] = value
+            self.assign(values)
+            return
+        self.buffer[self._index(index)] = self._encode(value)
+
+    def __iter__(self):
+        return iter(self.copy())
+
+    def __contains__(self, value: Any) -> bool:
+        start = self.offset + 1
+        return self._encode(value) in self.buffer[start:start + self.buffer[self.offset]]
+
+    def __eq__(self, other) -> bool:
+        return self.copy() == list(other)
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def index(self, value: Any) -> int:
+        start = self.offset + 1
+        return self.buffer[start:start + self.buffer[self.offset]].index(self._encode(value))
+
+    def count(self, value: Any) -> int:
+        start = self.offset + 1
+        return self.buffer[start:start + self.buffer[self.offset]].count(self._encode(value))
+
+    def copy(self) -> List[Any]:
+        start = self.offset + 1
+        return [self._decode(x) for x in self.buffer[start:start + self.buffer[self.offset]]]
+
+    def append(self, value: Any):
+        size = self.buffer[self.offset]
+        if size == self.capacity:
+            raise IndexError
+        self.buffer[self.offset + 1 + size] = self._encode(value)
+        self.buffer[self.offset] = size + 1
+
+    def insert(self, index: int, value: Any):
+        size = self.buffer[self.offset]
+        if size == self.capacity:
+            raise IndexError
+        index = max(min(index if index >= 0 else index + size, size), 0)
+        position = self.offset + 1 + index
+        end = self.offset + 1 + size
+        if position < end:
+            self.buffer[position + 1:end + 1] = self.buffer[position:end]
+        self.buffer[position] = self._encode(value)
+        self.buffer[self.offset] = size + 1
+
+    def pop(self, index: int = -1) -> Any:
+        position = self._index(index)
+        value = self.buffer[position]
+        end = self.offset + self.buffer[self.offset]
+        if position < end:
+            self.buffer[position:end] = self.buffer[position + 1:end + 1]
+        self.buffer[self.offset] -= 1
+        return self._decode(value)
+
+    def remove(self, value: Any):
+        start = self.offset + 1
+        self.pop(self.buffer[start:start + self.buffer[self.offset]].index(self._encode(value)))
+
+    def assign(self, values: Iterable[Any]):
+        values = [self._encode(x) for x in values]
+        if len(values) > self.capacity:
+            raise IndexError
+        self.buffer[self.offset] = len(values)
+        if len(values) > 0:
+            self.buffer[self.offset + 1:self.offset + 1 + len(values)] = array(self.buffer.typecode, values)
+
+
+class TokenList(BufferList):
+    __slots__ = ()
+
+    def _encode(self, value: str) -> int:
+        return TOKEN_INDICES[value]
+
+    def _decode(self, value: int) -> str:
+        return TOKEN_NAMES[value]
+
+
+class WonderList(BufferList):
+    __slots__ = ()
+
+    def _index(self, index: int) -> int:
+        return self.offset + 1 + 2 * (BufferList._index(self, index) - self.offset - 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.copy()[index]
+        position = self._index(index)
+        card_id = self.buffer[position + 1]
+        return self.buffer[position], None if card_id == NO_CARD else card_id
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            values = self.copy()
+            values[index] = value
+            self.assign(values)
+            return
+        position = self._index(index)
+        self.buffer[position] = value[0]
+        self.buffer[position + 1] = NO_CARD if value[1] is None else value[1]
+
+    def __contains__(self, value: Tuple[int, Optional[int]]) -> bool:
+        return value in self.copy()
+
+    def copy(self) -> List[Tuple[int, Optional[int]]]:
+        items = self.buffer[self.offset + 1:self.offset + 1 + 2 * self.buffer[self.offset]]
+        return [(items[i], None if items[i + 1] == NO_CARD else items[i + 1]) for i in range(0, len(items), 2)]
+
+    def append(self, value: Tuple[int, Optional[int]]):
+        size = self.buffer[self.offset]
+        if size == self.capacity:
+            raise IndexError
+        self.buffer[self.offset] = size + 1
+        self[size] = value
+
+    def insert(self, index: int, value: Tuple[int, Optional[int]]):
+        values = self.copy()
+        values.insert(index, value)
+        self.assign(values)
+
+    def pop(self, index: int = -1) -> Tuple[int, Optional[int]]:
+        values = self.copy()
+        value = values.pop(index)
+        self.assign(values)
+        return value
+
+    def remove(self, value: Tuple[int, Optional[int]]):
+        self.pop(self.copy().index(value))
+
+    def assign(self, values: Iterable[Tuple[int, Optional[int]]]):
+        values = list(values)
+        if len(values) > self.capacity:
+            raise IndexError
+        self.buffer[self.offset] = len(values)
+        for i, value in enumerate(values):
+            self[i] = value
+
+
+class CompactPlayerState:
+    __slots__ = ("index", "buffer", "offset", "cards", "progress_tokens", "bonuses", "score", "_wonders")
+
+    def __init__(self, index: int, buffer: array):
+        self.index = index
+        self.buffer = buffer
+        self.offset = PLAYERS + index * PLAYER_SIZE
+        self.cards = BufferList(buffer, self.offset + PLAYER_CARDS, CARDS_CAPACITY)
+        self.progress_tokens = TokenList(buffer, self.offset + PLAYER_PROGRESS_TOKENS, TOKENS_CAPACITY)
+        self._wonders = WonderList(buffer, self.offset + PLAYER_WONDERS, PLAYER_WONDERS_CAPACITY)
+        start = self.offset + PLAYER_BONUSES
+        self.bonuses = memoryview(buffer)[start:start + len(BONUSES)]
+        start = self.offset + PLAYER_SCORE
+        self.score = memoryview(buffer)[start:start + SCORE_SIZE]
+
+    @property
+    def coins(self) -> int:
+        return self.buffer[self.offset + PLAYER_COINS]
+
+    @coins.setter
+    def coins(self, value: int):
+        self.buffer[self.offset + PLAYER_COINS] = value
+
+    @property
+    def wonders(self) -> WonderList:
+        return self._wonders
+
+    @wonders.setter
+    def wonders(self, value: Iterable[Tuple[int, Optional[int]]]):
+        self._wonders.assign(value)
+
+    def clone(self) -> PlayerState:
+        return PlayerState(self.index,
+                           self.coins,
+                           self.cards.copy(),
+                           self.wonders.copy(),
+                           self.progress_tokens.copy(),
+                           self.bonuses.tolist(),
+                           self.score.tolist())
+
+
+class CompactMilitaryTrackState:
+    __slots__ = ("buffer",)
+
+    def __init__(self, buffer: array):
+        self.buffer = buffer
+
+    @property
+    def conflict_pawn(self) -> int:
+        return self.buffer[CONFLICT_PAWN]
+
+    @conflict_pawn.setter
+    def conflict_pawn(self, value: int):
+        self.buffer[CONFLICT_PAWN] = value
+
+    @property
+    def military_tokens(self) -> int:
+        return self.buffer[MILITARY_TOKENS]
+
+    @military_tokens.setter
+    def military_tokens(self, value: int):
+        self.buffer[MILITARY_TOKENS] = value
+
+    def clone(self) -> MilitaryTrackState:
+        return MilitaryTrackState(self.conflict_pawn, self.military_tokens)
+
+
+class CompactCardsBoardState:
+    __slots__ = ("buffer", "preset", "available_cards", "occupied", "card_slots", "rows", "_card_ids",
+                 "_purple_card_ids")
+
+    def __init__(self,
+                 buffer: array,
+                 preset: Optional[List[List[List[int]]]],
+                 available_cards: Optional[List[Tuple[int, Tuple[int, int]]]]):
+        self.buffer = buffer
+        self.preset = preset
+        self.available_cards = available_cards
+        self.occupied = None
+        self.card_slots = None
+        view = memoryview(buffer)
+        self.rows = [view[CARD_PLACES + i * BOARD_COLUMNS:CARD_PLACES + (i + 1) * BOARD_COLUMNS]
+                     for i in range(BOARD_ROWS)]
+        self._card_ids = BufferList(buffer, CARD_IDS, CARDS_CAPACITY)
+        self._purple_card_ids = BufferList(buffer, PURPLE_CARD_IDS, CARDS_CAPACITY)
+
+    @property
+    def age(self) -> int:
+        return self.buffer[BOARD_AGE]
+
+    @age.setter
+    def age(self, value: int):
+        self.buffer[BOARD_AGE] = value
+
+    @property
+    def card_places(self) -> List[memoryview]:
+        return self.rows if self.buffer[BOARD_GENERATED] else []
+
+    @card_places.setter
+    def card_places(self, value: List[List[int]]):
+        if len(value) == 0:
+            self.buffer[BOARD_GENERATED] = 0
+            return
+        if len(value) != BOARD_ROWS or any(len(row) != BOARD_COLUMNS for row in value):
+            raise ValueError
+        self.buffer[BOARD_GENERATED] = 1
+        for row, values in zip(self.rows, value):
+            row[:] = array(self.buffer.typecode, values)
+
+    @property
+    def card_ids(self) -> BufferList:
+        return self._card_ids
+
+    @card_ids.setter
+    def card_ids(self, value: Iterable[int]):
+        self._card_ids.assign(value)
+
+    @property
+    def purple_card_ids(self) -> BufferList:
+        return self._purple_card_ids
+
+    @purple_card_ids.setter
+    def purple_card_ids(self, value: Iterable[int]):
+        self._purple_card_ids.assign(value)
+
+    def clone(self) -> CardsBoardState:
+        return CardsBoardState(self.age,
+                               [row.tolist() for row in self.card_places],
+                               self.card_ids.copy(),
+                               self.purple_card_ids.copy(),
+                               self.preset,
+                               None)
+
+
+class CompactGameState:
+    """
+    Drop-in replacement for `GameState` that `Game` can run on, with a memcpy `clone`.
+    Views of the buffer are created lazily, so a clone that is never touched costs only the copy.
+    The card layout preset is immutable and shared between clones, `meta_info` is shared as in `GameState`.
+    """
+    __slots__ = ("buffer", "meta_info", "price_cache", "moves_cache", "zobrist_hash", "rng", "preset",
+                 "available_cards", "_players_state", "_military_track_state", "_cards_board_state",
+                 "_progress_tokens", "_rest_progress_tokens", "_discard_pile", "_wonders")
+
+    def __init__(self,
+                 buffer: array,
+                 meta_info: Dict[str, Any],
+                 preset: Optional[List[List[List[int]]]] = None,
+                 available_cards: Optional[List[Tuple[int, Tuple[int, int]]]] = None,
+                 price_cache: Optional[PriceCache] = None,
+                 zobrist_hash: Optional[int] = None,
+                 rng: Optional[GameRandom] = None):
+        self.buffer = buffer
+        self.meta_info = meta_info
+        self.preset = preset
+        self.available_cards = available_cards
+        self.price_cache = price_cache
+        self.moves_cache = None
+        self.zobrist_hash = zobrist_hash
+        self.rng = rng
+        self._players_state = None
+        self._military_track_state = None
+        self._cards_board_state = None
+        self._progress_tokens = None
+        self._rest_progress_tokens = None
+        self._discard_pile = None
+        self._wonders = None
+
+    @staticmethod
+    def from_state(state: GameState) -> 'CompactGameState':
+        buffer = array("h", bytes(2 * BUFFER_SIZE))
+        result = CompactGameState(buffer,
+                                  state.meta_info,
+                                  state.cards_board_state.preset,
+                                  state.cards_board_state.available_cards,
+                                  state.price_cache.clone() if state.price_cache is not None else None,
+                                  state.zobrist_hash,
+                                  state.rng.clone() if state.rng is not None else None)
+        result.age = state.age
+        result.current_player_index = state.current_player_index
+        result.is_double_turn = state.is_double_turn
+        result.game_status = state.game_status
+        result.winner = state.winner
+        result.progress_tokens.assign(state.progress_tokens)
+        result.rest_progress_tokens.assign(state.rest_progress_tokens)
+        result.discard_pile.assign(state.discard_pile)
+        result.wonders.assign(state.wonders)
+        for player_state, compact_player_state in zip(state.players_state, result.players_state):
+            compact_player_state.coins = player_state.coins
+            compact_player_state.cards.assign(player_state.cards)
+            compact_player_state.wonders = player_state.wonders
+            compact_player_state.progress_tokens.assign(player_state.progress_tokens)
+            compact_player_state.bonuses[:] = array(buffer.typecode, player_state.bonuses)
+            compact_player_state.score[:] = array(buffer.typecode, player_state.score)
+        result.military_track_state.conflict_pawn = state.military_track_state.conflict_pawn
+        result.military_track_state.military_tokens = state.military_track_state.military_tokens
+        cards_board_state = result.cards_board_state
+        cards_board_state.age = state.cards_board_state.age
+        cards_board_state.card_places = state.cards_board_state.card_places
+        cards_board_state.card_ids = state.cards_board_state.card_ids
+        cards_board_state.purple_card_ids = state.cards_board_state.purple_card_ids
+        return result
+
+    def to_state(self) -> GameState:
+        return GameState(self.age,
+                         self.current_player_index,
+                         self.progress_tokens.copy(),
+                         self.rest_progress_tokens.copy(),
+                         self.discard_pile.copy(),
+                         self.is_double_turn,
+                         self.wonders.copy(),
+                         [p.clone() for p in self.players_state],
+                         self.military_track_state.clone(),
+                         self.game_status,
+                         self.winner,
+                         self.cards_board_state.clone(),
+                         self.meta_info,
+                         self.price_cache.clone() if self.price_cache is not None else None,
+                         zobrist_hash=self.zobrist_hash,
+                         rng=self.rng.clone() if self.rng is not None else None)
+
+    def clone(self) -> 'CompactGameState':
+        cards_board_state = self._cards_board_state
+        price_cache = self.price_cache.clone() if self.price_cache is not None else None
+        rng = self.rng.clone() if self.rng is not None else None
+        if cards_board_state is None:
+            return CompactGameState(self.buffer[:],
+                                    self.meta_info,
+                                    self.preset,
+                                    self.available_cards,
+                                    price_cache,
+                                    self.zobrist_hash,
+                                    rng)
+        return CompactGameState(self.buffer[:],
+                                self.meta_info,
+                                cards_board_state.preset,
+                                cards_board_state.available_cards,
+                                price_cache,
+                                self.zobrist_hash,
+                                rng)
+
+    @property
+    def age(self) -> int:
+        return self.buffer[AGE]
+
+    @age.setter
+    def age(self, value: int):
+        self.buffer[AGE] = value
+
+    @property
+    def current_player_index(self) -> int:
+        return self.buffer[CURRENT_PLAYER_INDEX]
+
+    @current_player_index.setter
+    def current_player_index(self, value: int):
+        self.buffer[CURRENT_PLAYER_INDEX] = value
+
+    @property
+    def is_double_turn(self) -> bool:
+        return self.buffer[IS_DOUBLE_TURN] != 0
+
+    @is_double_turn.setter
+    def is_double_turn(self, value: bool):
+        self.buffer[IS_DOUBLE_TURN] = value
+
+    @property
+    def game_status(self) -> GameStatus:
+        return STATUSES[self.buffer[GAME_STATUS]]
+
+    @game_status.setter
+    def game_status(self, value: GameStatus):
+        self.buffer[GAME_STATUS] = value.value
+
+    @property
+    def winner(self) -> Optional[int]:
+        winner = self.buffer[WINNER]
+        return None if winner == NO_WINNER else winner
+
+    @winner.setter
+    def winner(self, value: Optional[int]):
+        self.buffer[WINNER] = NO_WINNER if value is None else value
+
+    @property
+    def progress_tokens(self) -> TokenList:
+        if self._progress_tokens is None:
+            self._progress_tokens = TokenList(self.buffer, PROGRESS_TOKENS, TOKENS_CAPACITY)
+        return self._progress_tokens
+
+    @property
+    def rest_progress_tokens(self) -> TokenList:
+        if self._rest_progress_tokens is None:
+            self._rest_progress_tokens = TokenList(self.buffer, REST_PROGRESS_TOKENS, TOKENS_CAPACITY)
+        return self._rest_progress_tokens
+
+    @property
+    def discard_pile(self) -> BufferList:
+        if self._discard_pile is None:
+            self._discard_pile = BufferList(self.buffer, DISCARD_PILE, CARDS_CAPACITY)
+        return self._discard_pile
+
+    @property
+    def wonders(self) -> BufferList:
+        if self._wonders is None:
+            self._wonders = BufferList(self.buffer, WONDERS, WONDERS_CAPACITY)
+        return self._wonders
+
+    @property
+    def players_state(self) -> List[CompactPlayerState]:
+        if self._players_state is None:
+            self._players_state = [CompactPlayerState(0, self.buffer), CompactPlayerState(1, self.buffer)]
+        return self._players_state
+
+    @property
+    def military_track_state(self) -> CompactMilitaryTrackState:
+        if self._military_track_state is None:
+            self._military_track_state = CompactMilitaryTrackState(self.buffer)
+        return self._military_track_state
+
+    @property
+    def cards_board_state(self) -> CompactCardsBoardState:
+        if self._cards_board_state is None:
+            self._cards_board_state = CompactCardsBoardState(self.buffer, self.preset, self.available_cards)
+        return self._cards_board_state
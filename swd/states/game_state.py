@@ -4,7 +4,10 @@ from typing import List, Optional, Any, Dict
 
 from .cards_board_state import CardsBoardState
 from .military_state_track import MilitaryTrackState
+from .moves_cache import MovesCache
 from .player_state import PlayerState
+from .price_cache import PriceCache
+from ..game_random import GameRandom
 
 
 class GameStatus(Enum):
@@ -19,6 +22,12 @@ class GameStatus(Enum):
     FINISHED = auto()
 
 
+class VictoryType(Enum):
+    SCIENTIFIC = "scientific"
+    MILITARY = "military"
+    CIVILIAN = "civilian"
+
+
 @dataclass
 class GameState:
     age: int
@@ -34,7 +43,10 @@ class GameState:
     winner: Optional[int]
     cards_board_state: CardsBoardState
     meta_info: Dict[str, Any]
-    price_cache: Optional[Dict[int, Dict[int, int]]] = None
+    price_cache: Optional[PriceCache] = None
+    moves_cache: Optional[MovesCache] = None
+    zobrist_hash: Optional[int] = None
+    rng: Optional[GameRandom] = None
 
     def clone(self) -> 'GameState':
         return GameState(self.age,
@@ -49,4 +61,7 @@ class GameState:
                          self.game_status,
                          self.winner,
                          self.cards_board_state.clone(),
-                         self.meta_info)
+                         self.meta_info,
+                         self.price_cache.clone() if self.price_cache is not None else None,
+                         zobrist_hash=self.zobrist_hash,
+                         rng=self.rng.clone() if self.rng is not None else None)
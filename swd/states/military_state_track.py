@@ -1,16 +1,19 @@
-from dataclasses import dataclass, field
-
-import numpy as np
+from dataclasses import dataclass
 
 
 MILITARY_TOKENS_COUNT = 4
+ALL_MILITARY_TOKENS = (1 << MILITARY_TOKENS_COUNT) - 1
 
 
 @dataclass
 class MilitaryTrackState:
+    """
+    Bit i of `military_tokens` is set while token i is on the track.
+    Tokens 0 and 1 take 5 and 2 coins from the first player, tokens 2 and 3 take 2 and 5 coins from the second one.
+    """
     conflict_pawn: int = 0
-    military_tokens: np.ndarray = field(default_factory=lambda: np.ones(MILITARY_TOKENS_COUNT, dtype=int))
+    military_tokens: int = ALL_MILITARY_TOKENS
 
     def clone(self) -> 'MilitaryTrackState':
         return MilitaryTrackState(self.conflict_pawn,
-                                  self.military_tokens.copy())
+                                  self.military_tokens)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict
+
+from ..action import Action, DiscardCardAction, BuyCardAction, BuildWonderAction
+
+
+@dataclass
+class MovesCache:
+    available_cards: Optional[List[Tuple[int, Tuple[int, int]]]] = None
+    discard_actions: List[DiscardCardAction] = field(default_factory=list)
+    buy_actions: List[BuyCardAction] = field(default_factory=list)
+    build_actions: Dict[int, List[BuildWonderAction]] = field(default_factory=dict)
+    price_versions: List[int] = field(default_factory=lambda: [-1, -1])
+    coins: List[int] = field(default_factory=lambda: [-1, -1])
+    actions: List[Optional[List[Action]]] = field(default_factory=lambda: [None, None])
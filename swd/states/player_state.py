@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
 from ..bonuses import BONUSES
+from ..score import SCORE_SIZE
 
 
 @dataclass
@@ -12,6 +13,7 @@ class PlayerState:
     wonders: List[Tuple[int, Optional[int]]] = field(default_factory=list)
     progress_tokens: List[str] = field(default_factory=list)
     bonuses: List[int] = field(default_factory=lambda: [0] * len(BONUSES))
+    score: List[int] = field(default_factory=lambda: [0] * SCORE_SIZE)
 
     def clone(self) -> 'PlayerState':
         return PlayerState(self.index,
@@ -19,4 +21,5 @@ class PlayerState:
                            self.cards.copy(),
                            self.wonders.copy(),
                            self.progress_tokens.copy(),
-                           self.bonuses.copy())
+                           self.bonuses.copy(),
+                           self.score.copy())
@@ -0,0 +1,123 @@
+import itertools
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from ..price_engine import PRICE_DEPENDENTS, OPPONENT_PRICE_DEPENDENTS
+
+
+_versions = itertools.count()
+
+
+@dataclass
+class PriceCacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    copies: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        queries = self.hits + self.misses
+        return self.hits / queries if queries > 0 else 0
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.copies = 0
+
+
+class PriceCache:
+    """
+    Per player prices keyed as in `PRICE_DEPENDENTS`.
+    Clones share price dicts until one of them writes, and share statistics with the cache they are cloned from.
+    `versions[player_index]` is unique across all caches and changes whenever a cached price of the player is dropped,
+    so equal versions mean equal cached prices.
+    While `journal` is set invalidations append the dropped keys and prices to it, so that `rollback` can undo them
+    without copying the cache for every action.
+    """
+    __slots__ = ("prices", "owned", "versions", "stats", "journal")
+
+    def __init__(self, stats: Optional[PriceCacheStats] = None):
+        self.prices: List[Dict[int, int]] = [{}, {}]
+        self.owned = [True, True]
+        self.versions = [next(_versions), next(_versions)]
+        self.stats = stats if stats is not None else PriceCacheStats()
+        self.journal: Optional[List[Tuple[int, FrozenSet[int], Dict[int, int]]]] = None
+
+    def clone(self) -> 'PriceCache':
+        result = PriceCache.__new__(PriceCache)
+        result.prices = self.prices.copy()
+        result.owned = [False, False]
+        result.versions = self.versions.copy()
+        result.stats = self.stats
+        result.journal = None
+        self.owned = [False, False]
+        return result
+
+    def get(self, player_index: int, key: int) -> Optional[int]:
+        price = self.prices[player_index].get(key)
+        if price is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return price
+
+    def put(self, player_index: int, key: int, price: int):
+        self._own(player_index)[key] = price
+
+    def invalidate(self, player_index: int, bonuses: Iterable[int]):
+        """
+        Drops prices that depend on `bonuses` of the player with `player_index`, their own and their opponent's.
+        """
+        for bonus in bonuses:
+            self._drop(player_index, PRICE_DEPENDENTS[bonus])
+            self._drop(1 - player_index, OPPONENT_PRICE_DEPENDENTS[bonus])
+
+    def rollback(self, journal: List[Tuple[int, FrozenSet[int], Dict[int, int]]], versions: List[int]):
+        """
+        Restores the prices dropped since `journal` was started and removes the prices of the same keys cached
+        after that, `versions` are the versions from then.
+        A player gets a new version instead if prices cached after the journal was started are removed
+        without their version changing.
+        """
+        for player_index in range(2):
+            entries = [(keys, stale) for index, keys, stale in journal if index == player_index]
+            if len(entries) == 0:
+                continue
+            restored = {}
+            for _, stale in reversed(entries):
+                restored.update(stale)
+            prices = self.prices[player_index]
+            extra = {key for keys, _ in entries for key in keys if key in prices and key not in restored}
+            if len(extra) > 0 or any(prices.get(key) != price for key, price in restored.items()):
+                prices = self._own(player_index)
+                for key in extra:
+                    del prices[key]
+                prices.update(restored)
+            if len(extra) > 0 and self.versions[player_index] == versions[player_index]:
+                self.versions[player_index] = next(_versions)
+            else:
+                self.versions[player_index] = versions[player_index]
+
+    def _drop(self, player_index: int, keys: FrozenSet[int]):
+        if len(keys) == 0:
+            return
+        prices = self.prices[player_index]
+        stale = [key for key in keys if key in prices]
+        if self.journal is not None:
+            self.journal.append((player_index, keys, {key: prices[key] for key in stale}))
+        if len(stale) == 0:
+            return
+        prices = self._own(player_index)
+        for key in stale:
+            del prices[key]
+        self.versions[player_index] = next(_versions)
+        self.stats.invalidations += len(stale)
+
+    def _own(self, player_index: int) -> Dict[int, int]:
+        if not self.owned[player_index]:
+            self.prices[player_index] = self.prices[player_index].copy()
+            self.owned[player_index] = True
+            self.stats.copies += 1
+        return self.prices[player_index]
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .game_state import GameStatus
+from ..action import Action
+
+
+@dataclass
+class UndoRecord:
+    action: Action
+    age: int
+    current_player_index: int
+    is_double_turn: bool
+    game_status: GameStatus
+    winner: Optional[int]
+    zobrist_hash: Optional[int]
+    coins: Tuple[int, int]
+    conflict_pawn: int
+    military_tokens: int
+    price_versions: Optional[List[int]]
+    price_journal: Optional[List[Tuple[int, FrozenSet[int], Dict[int, int]]]]
+    rng_state: int
+    index: int = -1
+    slots: Optional[List[Tuple[int, int, int]]] = None
+    board_age: Optional[int] = None
+    card_places: Optional[List[List[int]]] = None
+    card_ids: Optional[List[int]] = None
+    purple_card_ids: Optional[List[int]] = None
+    wonders: Optional[List[List[Tuple[int, Optional[int]]]]] = None
+    progress_tokens: Optional[List[str]] = None
+    rest_progress_tokens: Optional[List[str]] = None
@@ -0,0 +1,56 @@
+from typing import Any, List, Optional
+
+
+class TranspositionTable:
+    """
+    Fixed size table of values keyed by Zobrist hashes, a key is stored in slot `key & (size - 1)`.
+    A new entry replaces the stored one if it has the same key, comes from a newer generation or is searched
+    at least as deep. Call `new_generation` before every search so that entries of old searches are replaced first.
+    """
+    keys: List[Optional[int]]
+    depths: List[int]
+    generations: List[int]
+    values: List[Any]
+    generation: int
+
+    def __init__(self, size: int = 1 << 20):
+        if size <= 0 or size & (size - 1) != 0:
+            raise ValueError
+        self.mask = size - 1
+        self.keys = [None] * size
+        self.depths = [0] * size
+        self.generations = [0] * size
+        self.values = [None] * size
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self.keys) - self.keys.count(None)
+
+    def new_generation(self):
+        self.generation += 1
+
+    def clear(self):
+        size = len(self.keys)
+        self.keys = [None] * size
+        self.depths = [0] * size
+        self.generations = [0] * size
+        self.values = [None] * size
+        self.generation = 0
+
+    def get(self, key: int) -> Optional[Any]:
+        index = key & self.mask
+        if self.keys[index] != key:
+            return None
+        return self.values[index]
+
+    def put(self, key: int, value: Any, depth: int = 0) -> bool:
+        index = key & self.mask
+        stored_key = self.keys[index]
+        if stored_key is not None and stored_key != key and self.generations[index] == self.generation \
+                and self.depths[index] > depth:
+            return False
+        self.keys[index] = key
+        self.depths[index] = depth
+        self.generations[index] = self.generation
+        self.values[index] = value
+        return True
@@ -0,0 +1,79 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .action_space import ActionSpace, ACTIONS_COUNT
+from .game import Game
+from .game_random import GameRandom
+from .observation import Observation, OBSERVATION_SIZE
+from .states.game_state import GameState
+
+
+class VectorGame:
+    """
+    Steps `games_count` independent games with one call, finished games are reset automatically.
+    Returned arrays are owned by the vector game and overwritten by the next `reset` or `step`.
+    Games are created with seeds drawn from a generator seeded by `seed`, so runs with the same seed are identical.
+    """
+    states: List[GameState]
+    players: np.ndarray
+    observations: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+    masks: np.ndarray
+    rng: GameRandom
+
+    def __init__(self, games_count: int, seed: Optional[int] = None):
+        self.states = []
+        self.rng = GameRandom(seed)
+        self.players = np.zeros(games_count, dtype=np.int8)
+        self.observations = np.zeros((games_count, OBSERVATION_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(games_count, dtype=np.float32)
+        self.dones = np.zeros(games_count, dtype=bool)
+        self.masks = np.zeros((games_count, ACTIONS_COUNT), dtype=bool)
+
+    @property
+    def games_count(self) -> int:
+        return len(self.players)
+
+    def reset(self) -> Tuple[np.ndarray, np.ndarray]:
+        self.states = [Game.create(self.rng.getrandbits(64)) for _ in range(self.games_count)]
+        for i in range(self.games_count):
+            self._update(i)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        return self.observations, self.masks
+
+    def step(self, action_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Applies `action_ids[i]` to game `i` for the player in `players[i]`.
+        Rewards are given to that player: 1 for a win, -1 for a loss, 0 otherwise.
+        """
+        if len(action_ids) != self.games_count:
+            raise ValueError
+        for i, action_id in enumerate(action_ids):
+            if not self.masks[i, action_id]:
+                raise ValueError
+            state = self.states[i]
+            player_index = state.current_player_index
+            Game.apply_action(state, ActionSpace.decode(int(action_id), state))
+            if Game.is_finished(state):
+                if state.winner == player_index:
+                    self.rewards[i] = 1
+                elif state.winner == 1 - player_index:
+                    self.rewards[i] = -1
+                else:
+                    self.rewards[i] = 0
+                self.dones[i] = True
+                self.states[i] = Game.create(self.rng.getrandbits(64))
+            else:
+                self.rewards[i] = 0
+                self.dones[i] = False
+            self._update(i)
+        return self.observations, self.rewards, self.dones, self.masks
+
+    def _update(self, index: int):
+        state = self.states[index]
+        self.players[index] = state.current_player_index
+        Observation.encode(state, self.observations[index])
+        Game.legal_action_mask(state, self.masks[index])
@@ -1,26 +1,56 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, replace
+from typing import Dict, Any, Optional, Tuple
 
+from .entity_fields import bonus_vector, instant_bonus_items, invalidates_prices
 from .price import Price
 from .bonuses import BONUSES, INSTANT_BONUSES
+from .bonus_indices import POINTS, INSTANT_SHIELD
 
 
-@dataclass
+@dataclass(frozen=True)
 class Wonder:
+    """
+    Immutable, shared between games. Fields after `card_id` are derived from the ones before.
+    """
+    __slots__ = ("id", "name", "price", "bonuses", "instant_bonuses", "card_id", "points", "shields", "bonus_vector",
+                 "bonus_items", "instant_bonus_items", "invalidates_prices")
     id: int
     name: str
     price: Price
-    bonuses: Dict[int, int] = field(default_factory=dict)
-    instant_bonuses: List[int] = field(default_factory=list)
-    card_id: Optional[int] = None
+    bonuses: Dict[int, int]
+    instant_bonuses: Tuple[int, ...]
+    card_id: Optional[int]
+    points: int
+    shields: int
+    bonus_vector: Tuple[int, ...]
+    bonus_items: Tuple[Tuple[int, int], ...]
+    instant_bonus_items: Tuple[Tuple[int, int], ...]
+    invalidates_prices: bool
+
+    def __reduce__(self):
+        return Wonder, tuple(getattr(self, x) for x in self.__slots__)
 
     @property
     def is_built(self):
         return self.card_id is not None
 
-    @property
-    def points(self) -> int:
-        return self.bonuses.get(BONUSES.index("points"), 0)
+    def with_card(self, card_id: Optional[int]) -> 'Wonder':
+        return self if card_id == self.card_id else replace(self, card_id=card_id)
+
+    @staticmethod
+    def create(wonder_id: int, name: str, price: Price, bonuses: Dict[int, int], instant_bonuses: Tuple[int, ...]):
+        return Wonder(wonder_id,
+                      name,
+                      price,
+                      bonuses,
+                      instant_bonuses,
+                      None,
+                      bonuses.get(POINTS, 0),
+                      instant_bonuses[INSTANT_SHIELD],
+                      bonus_vector(bonuses),
+                      tuple(bonuses.items()),
+                      instant_bonus_items(instant_bonuses),
+                      invalidates_prices(bonuses))
 
     @staticmethod
     def from_dict(description: Dict[str, Any]):
@@ -35,9 +65,8 @@ class Wonder:
                 instant_bonuses[INSTANT_BONUSES.index(effect_name)] = effect
             else:
                 raise ValueError
-        return Wonder(description["id"],
-                      description["name"],
-                      Price(description["price"]),
-                      bonuses,
-                      instant_bonuses,
-                      None)
+        return Wonder.create(description["id"],
+                             description["name"],
+                             Price(description["price"]),
+                             bonuses,
+                             tuple(instant_bonuses))
@@ -0,0 +1,175 @@
+import random
+from typing import List, Optional, Tuple
+
+from .action import Action, BuyCardAction, DiscardCardAction, DestroyCardAction, PickWonderAction, BuildWonderAction, \
+    PickProgressTokenAction, PickDiscardedCardAction
+from .action_space import CARDS_COUNT, WONDERS_COUNT, TOKEN_NAMES, TOKEN_INDICES
+from .cards_board import CardsBoard, NO_CARD
+from .states.game_state import GameState, GameStatus
+from .states.military_state_track import MILITARY_TOKENS_COUNT
+
+
+"""
+Zobrist hash covers public state only: players' cards, coins, wonders and progress tokens, the conflict pawn and
+military tokens, board slots, progress tokens and wonders on the table, the discard pile, the current player,
+the age, the game status and the double turn flag. Unrevealed cards and the rest of the progress tokens aren't hashed.
+Empty board slots hash to 0, so an empty board and a board that isn't generated yet have the same hash.
+"""
+
+COINS_KEYS_COUNT = 256
+PAWN_POSITIONS = 19
+BOARD_SLOTS = 7 * 6
+SLOT_VALUES = CARDS_COUNT - NO_CARD
+
+_random = random.Random(7)
+
+
+def _keys(count: int) -> List[int]:
+    return [_random.getrandbits(64) for _ in range(count)]
+
+
+CARD_KEYS = [_keys(CARDS_COUNT), _keys(CARDS_COUNT)]
+COINS_KEYS = [_keys(COINS_KEYS_COUNT), _keys(COINS_KEYS_COUNT)]
+UNBUILT_WONDER_KEYS = [_keys(WONDERS_COUNT), _keys(WONDERS_COUNT)]
+BUILT_WONDER_KEYS = [_keys(WONDERS_COUNT), _keys(WONDERS_COUNT)]
+PLAYER_TOKEN_KEYS = [_keys(len(TOKEN_NAMES)), _keys(len(TOKEN_NAMES))]
+TOKEN_KEYS = _keys(len(TOKEN_NAMES))
+WONDER_KEYS = _keys(WONDERS_COUNT)
+DISCARD_KEYS = _keys(CARDS_COUNT)
+PAWN_KEYS = _keys(PAWN_POSITIONS)
+MILITARY_TOKEN_KEYS = _keys(MILITARY_TOKENS_COUNT)
+SLOT_KEYS = [[0] + _keys(SLOT_VALUES - 1) for _ in range(BOARD_SLOTS)]
+PLAYER_KEYS = _keys(2)
+AGE_KEYS = _keys(3)
+STATUS_KEYS = {status: key for status, key in zip(GameStatus, _keys(len(GameStatus)))}
+DOUBLE_TURN_KEY = _keys(1)[0]
+
+
+class Zobrist:
+    @staticmethod
+    def hash(state: GameState) -> int:
+        result = Zobrist.scalars(state) ^ Zobrist.board(state)
+        for wonder_id in state.wonders:
+            result ^= WONDER_KEYS[wonder_id]
+        for name in state.progress_tokens:
+            result ^= TOKEN_KEYS[TOKEN_INDICES[name]]
+        for card_id in state.discard_pile:
+            result ^= DISCARD_KEYS[card_id]
+        for player_state in state.players_state:
+            result ^= Zobrist.wonders(state, player_state.index) ^ Zobrist.tokens(state, player_state.index)
+            for card_id in player_state.cards:
+                result ^= CARD_KEYS[player_state.index][card_id]
+        return result
+
+    @staticmethod
+    def scalars(state: GameState) -> int:
+        result = COINS_KEYS[0][state.players_state[0].coins % COINS_KEYS_COUNT] ^ \
+            COINS_KEYS[1][state.players_state[1].coins % COINS_KEYS_COUNT] ^ \
+            PLAYER_KEYS[state.current_player_index] ^ \
+            AGE_KEYS[state.age] ^ \
+            STATUS_KEYS[state.game_status]
+        if state.is_double_turn:
+            result ^= DOUBLE_TURN_KEY
+        military_track_state = state.military_track_state
+        result ^= PAWN_KEYS[military_track_state.conflict_pawn + PAWN_POSITIONS // 2]
+        military_tokens = military_track_state.military_tokens
+        for i in range(MILITARY_TOKENS_COUNT):
+            if military_tokens >> i & 1:
+                result ^= MILITARY_TOKEN_KEYS[i]
+        return result
+
+    @staticmethod
+    def board(state: GameState) -> int:
+        result = 0
+        slot = 0
+        for row in state.cards_board_state.card_places:
+            for card_id in row:
+                result ^= SLOT_KEYS[slot][card_id - NO_CARD]
+                slot += 1
+        return result
+
+    @staticmethod
+    def slots(state: GameState, positions: List[Tuple[int, int]]) -> int:
+        result = 0
+        card_places = state.cards_board_state.card_places
+        for i, j in positions:
+            result ^= SLOT_KEYS[i * len(card_places[0]) + j][card_places[i][j] - NO_CARD]
+        return result
+
+    @staticmethod
+    def wonders(state: GameState, player_index: int) -> int:
+        result = 0
+        for wonder_id, card_id in state.players_state[player_index].wonders:
+            if card_id is None:
+                result ^= UNBUILT_WONDER_KEYS[player_index][wonder_id]
+            else:
+                result ^= BUILT_WONDER_KEYS[player_index][wonder_id]
+        return result
+
+    @staticmethod
+    def tokens(state: GameState, player_index: int) -> int:
+        result = 0
+        for name in state.players_state[player_index].progress_tokens:
+            result ^= PLAYER_TOKEN_KEYS[player_index][TOKEN_INDICES[name]]
+        return result
+
+    @staticmethod
+    def touched(state: GameState, action: Action, player_index: int) -> int:
+        """
+        Hash of the components `action` can change, except scalars and board slots.
+        """
+        if isinstance(action, (BuyCardAction, PickDiscardedCardAction)):
+            cards = state.players_state[player_index].cards
+            return CARD_KEYS[player_index][action.card_id] if action.card_id in cards else 0
+        elif isinstance(action, DiscardCardAction):
+            return DISCARD_KEYS[action.card_id] if state.discard_pile.count(action.card_id) % 2 == 1 else 0
+        elif isinstance(action, DestroyCardAction):
+            result = DISCARD_KEYS[action.card_id] if state.discard_pile.count(action.card_id) % 2 == 1 else 0
+            if action.card_id in state.players_state[1 - player_index].cards:
+                result ^= CARD_KEYS[1 - player_index][action.card_id]
+            return result
+        elif isinstance(action, PickWonderAction):
+            result = Zobrist.wonders(state, player_index)
+            if action.wonder_id in state.wonders:
+                result ^= WONDER_KEYS[action.wonder_id]
+            return result
+        elif isinstance(action, BuildWonderAction):
+            return Zobrist.wonders(state, 0) ^ Zobrist.wonders(state, 1)
+        elif isinstance(action, PickProgressTokenAction):
+            result = Zobrist.tokens(state, player_index)
+            for name in state.progress_tokens:
+                result ^= TOKEN_KEYS[TOKEN_INDICES[name]]
+            return result
+        return 0
+
+    @staticmethod
+    def positions(state: GameState, action: Action) -> List[Tuple[int, int]]:
+        if not isinstance(action, (BuyCardAction, DiscardCardAction, BuildWonderAction)):
+            return []
+        return CardsBoard.affected_positions(action.pos)
+
+    @staticmethod
+    def begin(state: GameState, action: Action) -> Optional[Tuple[int, int, int, bool, List[Tuple[int, int]]]]:
+        """
+        Hashes the components `action` can change before it's applied, `end` replaces them in the state hash.
+        Returns None if the state isn't hashed.
+        """
+        if state.zobrist_hash is None:
+            return None
+        player_index = state.current_player_index
+        positions = Zobrist.positions(state, action)
+        removed = Zobrist.scalars(state) ^ Zobrist.touched(state, action, player_index) ^ \
+            Zobrist.slots(state, positions)
+        return removed, player_index, state.age, len(state.cards_board_state.card_places) > 0, positions
+
+    @staticmethod
+    def end(state: GameState, action: Action, context: Optional[Tuple[int, int, int, bool, List[Tuple[int, int]]]]):
+        if context is None:
+            return
+        removed, player_index, age, is_board_generated, positions = context
+        added = Zobrist.scalars(state) ^ Zobrist.touched(state, action, player_index)
+        if age != state.age or not is_board_generated:
+            added ^= Zobrist.board(state)
+        else:
+            added ^= Zobrist.slots(state, positions)
+        state.zobrist_hash ^= removed ^ added